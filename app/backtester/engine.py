@@ -1,8 +1,79 @@
+import itertools
+import multiprocessing
+import os
+import tempfile
+import uuid
+from concurrent.futures import FIRST_COMPLETED, Executor, ProcessPoolExecutor, wait
+from dataclasses import dataclass
 import pandas as pd
 import numpy as np
 from datetime import datetime
 from typing import Dict, List
 
+from .engine_numba import _simulate
+from .metrics import PerformanceMetrics
+
+
+@dataclass(frozen=True)
+class MarketArrays:
+    """Price/volume columns extracted once as C-contiguous float64 arrays
+    
+    Shared across a parameter sweep, and handed straight to the compiled
+    indicator and simulation kernels without further copies.
+    """
+    index: pd.Index
+    close: np.ndarray
+    volume: np.ndarray
+    
+    @classmethod
+    def from_frame(cls, data: pd.DataFrame) -> 'MarketArrays':
+        return cls(
+            index=data.index,
+            close=np.ascontiguousarray(data['close'].to_numpy(dtype=np.float64)),
+            volume=np.ascontiguousarray(data['volume'].to_numpy(dtype=np.float64))
+            if 'volume' in data.columns else None
+        )
+
+
+def process_pool(max_workers: int = None, initializer=None) -> ProcessPoolExecutor:
+    """Process pool whose workers do not inherit this process's threads
+    
+    Forking after one of Numba's parallel kernels has started its TBB
+    threading layer leaves the process hanging at exit, so workers are
+    started from a forkserver (spawned where forkservers are unavailable).
+    The forkserver preloads the engine and strategies once.
+    """
+    if 'forkserver' in multiprocessing.get_all_start_methods():
+        context = multiprocessing.get_context('forkserver')
+        context.set_forkserver_preload(['app.backtester.engine', 'app.strategies'])
+    else:
+        context = multiprocessing.get_context('spawn')
+    return ProcessPoolExecutor(max_workers=max_workers, mp_context=context,
+                               initializer=initializer)
+
+
+# Market arrays of the grid run a worker process last served, loaded from
+# disk once per worker rather than shipped with every task
+_worker_data_path = None
+_worker_arrays = None
+
+
+def _load_worker_data(data_path: str):
+    """Load a grid's data into this worker unless it already holds it"""
+    global _worker_data_path, _worker_arrays
+    if data_path != _worker_data_path:
+        _worker_arrays = MarketArrays.from_frame(pd.read_pickle(data_path))
+        _worker_data_path = data_path
+
+
+def _run_one(engine, strategy_cls, params: Dict, data_path: str) -> Dict:
+    """Backtest a single parameter combination inside a worker process"""
+    _load_worker_data(data_path)
+    strategy = strategy_cls(**params)
+    results = engine.run_backtest_arrays(_worker_arrays, strategy)
+    return PerformanceMetrics(results).calculate_all_metrics()
+
+
 class BacktestEngine:
     """Core backtesting engine with enhanced risk management"""
     
@@ -16,6 +87,9 @@ class BacktestEngine:
         self.take_profit_pct = take_profit_pct  # 15% take profit
         self.max_risk_per_trade = max_risk_per_trade  # Max 2% risk per trade
         self.open_positions = []  # Track open positions for risk management
+        self.cash_buffer = 0.95  # Invest 95% of cash, keep 5% as buffer
+        self.buy_mul = 1 + commission  # Cost per unit of notional bought
+        self.sell_mul = 1 - commission  # Proceeds per unit of notional sold
         
     def run_backtest(self, data: pd.DataFrame, strategy) -> Dict:
         """Run backtest with the given strategy"""
@@ -23,99 +97,150 @@ class BacktestEngine:
         # Generate signals using the strategy
         signal_data = strategy.generate_signals(data)
         
-        # Initialize portfolio tracking
-        portfolio = {
-            'cash': self.initial_capital,
-            'holdings': 0,
-            'portfolio_value': [],
-            'dates': [],
-            'returns': []
+        return self._backtest_signals(signal_data)
+    
+    def run_batch(self, data_by_symbol: Dict[str, pd.DataFrame], strategy) -> Dict[str, Dict]:
+        """Run the same strategy over several symbols on their common dates
+        
+        Closes are stacked column-wise so strategies implementing
+        generate_signals_batch compute indicators for every symbol in one
+        parallel kernel call; other strategies are run symbol by symbol.
+        """
+        closes = pd.concat(
+            {symbol: data['close'] for symbol, data in data_by_symbol.items()},
+            axis=1, join='inner'
+        )
+        
+        try:
+            signals = strategy.generate_signals_batch(closes)
+        except NotImplementedError:
+            return {
+                symbol: self.run_backtest(data.loc[closes.index], strategy)
+                for symbol, data in data_by_symbol.items()
+            }
+        
+        return {
+            symbol: self._backtest_signals(pd.DataFrame({
+                'close': closes[symbol].loc[signals.index],
+                'signal': signals[symbol]
+            }))
+            for symbol in closes.columns
         }
+    
+    def run_backtest_arrays(self, arrays: MarketArrays, strategy) -> Dict:
+        """Backtest a strategy from pre-extracted arrays via generate_signals_from_arrays
         
-        trades = []
-        equity_curve = []
+        Every registered strategy implements array signals; the base
+        strategy raises NotImplementedError.
+        """
+        signal = strategy.generate_signals_from_arrays(arrays.close, arrays.volume)
+        signal_data = pd.DataFrame(
+            {'close': arrays.close, 'signal': signal}, index=arrays.index
+        ).iloc[strategy.warmup_period:]
+        return self._backtest_signals(signal_data)
+    
+    def _backtest_signals(self, signal_data: pd.DataFrame) -> Dict:
+        """Simulate trading on a frame of close prices and strategy signals"""
+        prices = signal_data['close'].to_numpy(dtype=np.float64)
+        n_bars = len(prices)
+        if 'signal' in signal_data.columns:
+            signals = signal_data['signal'].to_numpy(dtype=np.int8)
+        else:
+            signals = np.zeros(n_bars, dtype=np.int8)
         
-        prev_portfolio_value = self.initial_capital
+        # Step through the bars in compiled code
+        (portfolio_value, cash_arr, holdings_value, returns,
+         trade_idx, trade_qty, trade_action) = _simulate(
+            prices, signals, float(self.initial_capital),
+            self.buy_mul, self.sell_mul, self.cash_buffer
+        )
         
-        for i, (date, row) in enumerate(signal_data.iterrows()):
-            current_price = row['close']  # Use lowercase 'close'
-            signal = row.get('signal', 0)  # Get signal from strategy
-            
-            # Execute trades based on signals
-            if signal == 1 and portfolio['holdings'] == 0:  # Buy signal
-                # Calculate how many shares we can buy
-                available_cash = portfolio['cash'] * 0.95  # Keep 5% as buffer
-                shares_to_buy = int(available_cash / (current_price * (1 + self.commission)))
-                
-                if shares_to_buy > 0:
-                    cost = shares_to_buy * current_price * (1 + self.commission)
-                    portfolio['cash'] -= cost
-                    portfolio['holdings'] += shares_to_buy
-                    
-                    trades.append({
-                        'date': date,
-                        'action': 'BUY',
-                        'price': current_price,
-                        'quantity': shares_to_buy,
-                        'value': cost,
-                        'commission': cost * self.commission
-                    })
-            
-            elif signal == -1 and portfolio['holdings'] > 0:  # Sell signal
-                # Sell all holdings
-                shares_to_sell = portfolio['holdings']
-                proceeds = shares_to_sell * current_price * (1 - self.commission)
-                portfolio['cash'] += proceeds
-                
-                trades.append({
-                    'date': date,
-                    'action': 'SELL',
-                    'price': current_price,
-                    'quantity': shares_to_sell,
-                    'value': proceeds,
-                    'commission': proceeds * self.commission
-                })
-                
-                portfolio['holdings'] = 0
-            
-            # Calculate current portfolio value
-            current_portfolio_value = portfolio['cash'] + (portfolio['holdings'] * current_price)
-            daily_return = (current_portfolio_value - prev_portfolio_value) / prev_portfolio_value
-            
-            portfolio['portfolio_value'].append(current_portfolio_value)
-            portfolio['dates'].append(date)
-            portfolio['returns'].append(daily_return)
-            
-            equity_curve.append({
-                'date': date,
-                'portfolio_value': current_portfolio_value,
-                'cash': portfolio['cash'],
-                'holdings_value': portfolio['holdings'] * current_price,
-                'returns': daily_return
+        # Rebuild the trade log from the parallel arrays
+        trades = []
+        for i, quantity, action in zip(trade_idx, trade_qty, trade_action):
+            price = prices[i]
+            value = quantity * price * (self.buy_mul if action == 1 else self.sell_mul)
+            trades.append({
+                'date': signal_data.index[i],
+                'action': 'BUY' if action == 1 else 'SELL',
+                'price': price,
+                'quantity': int(quantity),
+                'value': value,
+                'commission': value * self.commission
             })
-            
-            prev_portfolio_value = current_portfolio_value
         
         # Create equity curve DataFrame
-        equity_df = pd.DataFrame(equity_curve)
-        equity_df.set_index('date', inplace=True)
-        
-        # Calculate PnL for each trade
-        for i in range(1, len(trades)):
-            if trades[i]['action'] == 'SELL' and trades[i-1]['action'] == 'BUY':
-                buy_price = trades[i-1]['price']
-                sell_price = trades[i]['price']
-                quantity = trades[i]['quantity']
-                pnl = (sell_price - buy_price) * quantity
-                trades[i]['pnl'] = pnl
+        equity_df = pd.DataFrame({
+            'portfolio_value': portfolio_value,
+            'cash': cash_arr,
+            'holdings_value': holdings_value,
+            'returns': returns
+        }, index=signal_data.index.rename('date'))
+        
+        # Calculate PnL for each closed trade. Trades strictly alternate
+        # BUY/SELL, so every exit pairs with the entry right before it.
+        is_entry = trade_action == 1
+        exit_qty = trade_qty[~is_entry]
+        entry_prices = prices[trade_idx[is_entry][:len(exit_qty)]]
+        exit_prices = prices[trade_idx[~is_entry]]
+        pnls = (exit_prices - entry_prices) * exit_qty
+        for trade, pnl in zip(trades[1::2], pnls):
+            trade['pnl'] = pnl
         
         return {
             'equity_curve': equity_df,
             'trades': trades,
-            'final_portfolio_value': current_portfolio_value,
+            'trade_bars': trade_idx,  # Row of each trade in the equity curve
+            'final_portfolio_value': portfolio_value[-1] if n_bars else self.initial_capital,
             'initial_capital': self.initial_capital
         }
     
+    def run_grid(self, data: pd.DataFrame, strategy_cls, param_grid: Dict[str, List],
+                 max_workers: int = None, executor: Executor = None) -> List[Dict]:
+        """Backtest every parameter combination of the grid in parallel processes
+        
+        Runs on `executor` when given (a long-lived process pool shared
+        between calls, with at most `max_workers` combinations in flight),
+        otherwise on a pool of `max_workers` processes created for this call.
+        """
+        keys = list(param_grid)
+        combos = [dict(zip(keys, values)) for values in itertools.product(*param_grid.values())]
+        if not combos:
+            return []
+        
+        # Serialize the data once; each worker loads it on its first task
+        # instead of receiving a pickled copy with every task. The uuid keeps
+        # paths unique, as workers identify cached data by its path.
+        fd, data_path = tempfile.mkstemp(prefix=f'grid-{uuid.uuid4().hex}-', suffix='.pkl')
+        os.close(fd)
+        try:
+            data.to_pickle(data_path)
+            if executor is None:
+                with process_pool(max_workers) as own_executor:
+                    return self._run_combos(own_executor, strategy_cls, combos, data_path,
+                                            max_in_flight=len(combos))
+            return self._run_combos(executor, strategy_cls, combos, data_path,
+                                    max_in_flight=max_workers or len(combos))
+        finally:
+            os.remove(data_path)
+    
+    def _run_combos(self, executor: Executor, strategy_cls, combos: List[Dict],
+                    data_path: str, max_in_flight: int) -> List[Dict]:
+        """Submit the combinations, keeping at most max_in_flight pending"""
+        results = [None] * len(combos)
+        pending = {}
+        remaining = iter(enumerate(combos))
+        for i, params in itertools.islice(remaining, max_in_flight):
+            pending[executor.submit(_run_one, self, strategy_cls, params, data_path)] = i
+        while pending:
+            done, _ = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                i = pending.pop(future)
+                results[i] = {'parameters': combos[i], 'metrics': future.result()}
+            for i, params in itertools.islice(remaining, len(done)):
+                pending[executor.submit(_run_one, self, strategy_cls, params, data_path)] = i
+        return results
+    
     def calculate_position_size(self, current_portfolio_value: float, price: float, 
                               volatility: float = None) -> int:
         """Calculate position size based on risk management rules"""
@@ -138,6 +263,10 @@ class BacktestEngine:
         
         return max(0, shares)
     
+    def calculate_positions_value(self, amounts: np.ndarray, last_prices: np.ndarray) -> float:
+        """Mark a book of open positions to market (aligned share amounts and prices)"""
+        return float(np.vdot(amounts, last_prices))
+    
     def check_stop_loss(self, entry_price: float, current_price: float, position_type: str) -> bool:
         """Check if stop loss should be triggered"""
         if position_type == 'long':
@@ -166,13 +295,13 @@ class BacktestEngine:
         rolling_sharpe = (returns.rolling(window=30).mean() * 252) / rolling_vol
         
         # Current drawdown
-        portfolio_values = equity_curve['portfolio_value']
-        peak = portfolio_values.expanding().max()
-        current_drawdown = (portfolio_values.iloc[-1] - peak.iloc[-1]) / peak.iloc[-1] * 100
+        portfolio_values = equity_curve['portfolio_value'].to_numpy()
+        peak = np.fmax.accumulate(portfolio_values)  # Skips NaN like expanding().max()
+        current_drawdown = (portfolio_values[-1] - peak[-1]) / peak[-1] * 100
         
         return {
             'current_volatility': rolling_vol.iloc[-1] if not rolling_vol.empty else 0,
             'current_sharpe': rolling_sharpe.iloc[-1] if not rolling_sharpe.empty else 0,
             'current_drawdown': current_drawdown,
-            'portfolio_value': portfolio_values.iloc[-1]
+            'portfolio_value': portfolio_values[-1]
         }
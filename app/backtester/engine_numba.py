@@ -0,0 +1,61 @@
+import numpy as np
+
+from ..jit import njit
+
+
+@njit(cache=True, nogil=True)
+def _simulate(prices, signals, cash0, buy_mul, sell_mul, cash_buffer):
+    """Bar-by-bar long-only simulation on typed NumPy arrays
+
+    Buys with `cash_buffer` of the available cash on a buy signal while flat
+    and sells the whole position on the next sell signal; commission enters
+    through the precomputed buy_mul = 1 + c and sell_mul = 1 - c. Returns the equity curve
+    columns (portfolio value, cash, holdings value and per-bar returns) plus
+    the trade log as parallel arrays of bar index, quantity and action
+    (1 = buy, -1 = sell).
+    """
+    n_bars = prices.shape[0]
+    portfolio_value = np.empty(n_bars)
+    cash_arr = np.empty(n_bars)
+    holdings_value = np.empty(n_bars)
+    returns = np.empty(n_bars)
+    trade_idx = np.empty(n_bars, dtype=np.int64)
+    trade_qty = np.empty(n_bars, dtype=np.int64)
+    trade_action = np.empty(n_bars, dtype=np.int8)
+
+    cash = cash0
+    holdings = 0
+    n_trades = 0
+    prev_portfolio_value = cash0
+
+    for i in range(n_bars):
+        price = prices[i]
+        signal = signals[i]
+
+        if signal == 1 and holdings == 0:  # Buy signal
+            shares_to_buy = int(cash * cash_buffer / (price * buy_mul))
+            if shares_to_buy > 0:
+                cash -= shares_to_buy * price * buy_mul
+                holdings = shares_to_buy
+                trade_idx[n_trades] = i
+                trade_qty[n_trades] = shares_to_buy
+                trade_action[n_trades] = 1
+                n_trades += 1
+
+        elif signal == -1 and holdings > 0:  # Sell signal
+            cash += holdings * price * sell_mul
+            trade_idx[n_trades] = i
+            trade_qty[n_trades] = holdings
+            trade_action[n_trades] = -1
+            n_trades += 1
+            holdings = 0
+
+        current_portfolio_value = cash + holdings * price
+        portfolio_value[i] = current_portfolio_value
+        cash_arr[i] = cash
+        holdings_value[i] = holdings * price
+        returns[i] = (current_portfolio_value - prev_portfolio_value) / prev_portfolio_value
+        prev_portfolio_value = current_portfolio_value
+
+    return (portfolio_value, cash_arr, holdings_value, returns,
+            trade_idx[:n_trades], trade_qty[:n_trades], trade_action[:n_trades])
@@ -5,12 +5,37 @@ from typing import Dict
 class PerformanceMetrics:
     """Calculate comprehensive performance metrics for backtesting results"""
     
+    # Metrics a parameter sweep can rank by, mapped to whether higher is
+    # better. VaR and CVaR are (negative) returns, so higher means less loss.
+    RANKING_METRICS = {
+        'total_return_pct': True,
+        'sharpe_ratio': True,
+        'sortino_ratio': True,
+        'calmar_ratio': True,
+        'max_drawdown': False,
+        'win_rate': True,
+        'profit_factor': True,
+        'var_5': True,
+        'cvar_5': True,
+    }
+    
     def __init__(self, backtest_results: Dict):
         self.results = backtest_results
         self.equity_curve = backtest_results['equity_curve']
         self.trades = backtest_results['trades']
         self.initial_capital = backtest_results['initial_capital']
         self.final_value = backtest_results['final_portfolio_value']
+        
+        # Non-NaN returns and portfolio values, extracted once and shared by
+        # every metric. Single precision halves the memory traffic of these
+        # reductions and is plenty for percentage statistics.
+        returns = self.equity_curve['returns'].to_numpy(dtype=np.float32)
+        self._returns = returns[~np.isnan(returns)]
+        values = self.equity_curve['portfolio_value'].to_numpy(dtype=np.float32)
+        self._values = values[~np.isnan(values)]
+        
+        # PnL of every closed trade
+        self._pnl = np.array([t['pnl'] for t in self.trades if 'pnl' in t], dtype=np.float64)
     
     def calculate_total_return(self) -> float:
         """Calculate total return in absolute terms"""
@@ -22,37 +47,37 @@ class PerformanceMetrics:
     
     def calculate_sharpe_ratio(self, risk_free_rate: float = 0.02) -> float:
         """Calculate Sharpe ratio (assuming 252 trading days per year)"""
-        returns = self.equity_curve['returns'].dropna()
-        if len(returns) == 0 or returns.std() == 0:
+        returns = self._returns
+        if len(returns) < 2:
+            return 0.0
+        
+        std = returns.std(ddof=1)
+        if std == 0:
             return 0.0
         
         excess_returns = returns.mean() - (risk_free_rate / 252)
-        return (excess_returns / returns.std()) * np.sqrt(252)
+        return float((excess_returns / std) * np.sqrt(252))
     
     def calculate_max_drawdown(self) -> float:
         """Calculate maximum drawdown percentage"""
-        portfolio_values = self.equity_curve['portfolio_value']
-        peak = portfolio_values.expanding().max()
+        portfolio_values = self._values
+        if len(portfolio_values) == 0:
+            return 0.0
+        peak = np.maximum.accumulate(portfolio_values)
         drawdown = (portfolio_values - peak) / peak
-        return abs(drawdown.min()) * 100
+        return float(abs(drawdown.min()) * 100)
     
     def calculate_win_rate(self) -> float:
         """Calculate win rate percentage"""
-        profitable_trades = [t for t in self.trades if t.get('pnl', 0) > 0]
-        total_trades = len([t for t in self.trades if 'pnl' in t])
-        
-        if total_trades == 0:
+        if len(self._pnl) == 0:
             return 0.0
         
-        return (len(profitable_trades) / total_trades) * 100
+        return (self._pnl > 0).mean() * 100
     
     def calculate_profit_factor(self) -> float:
         """Calculate profit factor (gross profit / gross loss)"""
-        profits = [t['pnl'] for t in self.trades if t.get('pnl', 0) > 0]
-        losses = [abs(t['pnl']) for t in self.trades if t.get('pnl', 0) < 0]
-        
-        gross_profit = sum(profits) if profits else 0
-        gross_loss = sum(losses) if losses else 0
+        gross_profit = self._pnl[self._pnl > 0].sum()
+        gross_loss = -self._pnl[self._pnl < 0].sum()
         
         if gross_loss == 0:
             return float('inf') if gross_profit > 0 else 0
@@ -67,7 +92,7 @@ class PerformanceMetrics:
     
     def calculate_sortino_ratio(self, risk_free_rate: float = 0.02) -> float:
         """Calculate Sortino ratio (uses downside deviation instead of total volatility)"""
-        returns = self.equity_curve['returns'].dropna()
+        returns = self._returns
         
         if len(returns) == 0:
             return 0.0
@@ -76,68 +101,82 @@ class PerformanceMetrics:
         
         if len(negative_returns) == 0:
             return float('inf') if returns.mean() > 0 else 0
+        if len(negative_returns) == 1:
+            return 0.0
         
-        downside_std = negative_returns.std() * np.sqrt(252)
+        downside_std = negative_returns.std(ddof=1) * np.sqrt(252)
         excess_return = returns.mean() * 252 - risk_free_rate
         
-        return excess_return / downside_std if downside_std != 0 else 0
+        return float(excess_return / downside_std) if downside_std != 0 else 0
     
     def calculate_var(self, confidence_level: float = 0.05) -> float:
         """Calculate Value at Risk at given confidence level"""
-        returns = self.equity_curve['returns'].dropna()
-        if len(returns) == 0:
-            return 0.0
-        return np.percentile(returns, confidence_level * 100)
+        return self._tail_risk(confidence_level)[0]
     
     def calculate_cvar(self, confidence_level: float = 0.05) -> float:
         """Calculate Conditional Value at Risk (Expected Shortfall)"""
-        returns = self.equity_curve['returns'].dropna()
+        return self._tail_risk(confidence_level)[1]
+    
+    def _tail_risk(self, confidence_level: float = 0.05):
+        """VaR and CVaR from one O(n) partition of the returns
+        
+        VaR is np.percentile's linear interpolation between the two order
+        statistics around (n - 1) * confidence_level, found with
+        np.partition instead of a full sort; CVaR is the mean of the
+        returns at or below it.
+        """
+        returns = self._returns
         if len(returns) == 0:
-            return 0.0
-        var = self.calculate_var(confidence_level)
-        tail_returns = returns[returns <= var]
-        return tail_returns.mean() if len(tail_returns) > 0 else 0.0
+            return 0.0, 0.0
+        h = (len(returns) - 1) * confidence_level
+        lo, hi = int(np.floor(h)), int(np.ceil(h))
+        partitioned = np.partition(returns, [lo, hi])
+        below, above = float(partitioned[lo]), float(partitioned[hi])
+        var = below + (h - lo) * (above - below)
+        tail = partitioned[partitioned <= var]
+        return var, float(tail.mean()) if len(tail) > 0 else 0.0
     
     def calculate_information_ratio(self, benchmark_returns=None) -> float:
         """Calculate Information Ratio (Active Return / Tracking Error)"""
         if benchmark_returns is None:
             return 0.0
         
-        returns = self.equity_curve['returns'].dropna()
+        returns = self._returns
+        benchmark_returns = np.asarray(benchmark_returns, dtype=np.float32)
         if len(returns) == 0 or len(benchmark_returns) == 0:
             return 0.0
         
         # Align lengths
         min_length = min(len(returns), len(benchmark_returns))
-        returns = returns.tail(min_length)
-        benchmark_returns = benchmark_returns.tail(min_length)
+        if min_length < 2:
+            return 0.0
         
-        active_returns = returns - benchmark_returns
-        tracking_error = active_returns.std() * np.sqrt(252)
+        active_returns = returns[-min_length:] - benchmark_returns[-min_length:]
+        tracking_error = active_returns.std(ddof=1) * np.sqrt(252)
         
         if tracking_error == 0:
             return 0.0
         
-        return (active_returns.mean() * 252) / tracking_error
+        return float((active_returns.mean() * 252) / tracking_error)
     
-    def calculate_monthly_returns(self) -> Dict:
-        """Calculate monthly returns"""
-        equity_curve = self.equity_curve.copy()
-        equity_curve['month'] = equity_curve.index.to_period('M')
+    def calculate_monthly_returns(self) -> pd.Series:
+        """Calculate monthly returns (%) as a Series indexed by monthly Period"""
+        portfolio_values = self.equity_curve['portfolio_value']
+        index = self.equity_curve.index
+        if getattr(index, 'tz', None) is not None:
+            index = index.tz_localize(None)  # Months of the local calendar
+        months = pd.PeriodIndex(index, freq='M')
+        monthly = portfolio_values.groupby(months).agg(['first', 'last', 'count'])
         
-        monthly_returns = {}
-        for month in equity_curve['month'].unique():
-            month_data = equity_curve[equity_curve['month'] == month]
-            if len(month_data) > 1:
-                start_value = month_data['portfolio_value'].iloc[0]
-                end_value = month_data['portfolio_value'].iloc[-1]
-                monthly_return = ((end_value - start_value) / start_value) * 100
-                monthly_returns[month] = monthly_return
+        # Months with a single bar have no return to report
+        monthly = monthly[monthly['count'] > 1]
+        monthly_returns = ((monthly['last'] - monthly['first']) / monthly['first']) * 100
         
-        return monthly_returns
+        return monthly_returns.rename('return')
     
     def calculate_all_metrics(self) -> Dict:
         """Calculate all performance metrics"""
+        var_5, cvar_5 = self._tail_risk()
         return {
             'initial_capital': self.initial_capital,
             'final_capital': self.final_value,
@@ -149,8 +188,8 @@ class PerformanceMetrics:
             'max_drawdown': self.calculate_max_drawdown(),
             'win_rate': self.calculate_win_rate(),
             'profit_factor': self.calculate_profit_factor(),
-            'var_5': self.calculate_var(),
-            'cvar_5': self.calculate_cvar(),
+            'var_5': var_5,
+            'cvar_5': cvar_5,
             'information_ratio': self.calculate_information_ratio(),
-            'total_trades': len([t for t in self.trades if 'pnl' in t])
+            'total_trades': len(self._pnl)
         }
@@ -0,0 +1,74 @@
+import operator
+import threading
+from typing import Dict, List
+
+from cachetools import TTLCache, cached
+
+from .market_data import fetch_info
+
+FUNDAMENTALS_TTL = 60 * 60  # Seconds a fundamentals summary is reused
+
+# (info key, comparison, threshold, message), reported in this order
+PRO_RULES = (
+    ("trailingPE", operator.lt, 20, "Low trailing P/E ratio (potentially undervalued)"),
+    ("profitMargins", operator.gt, 0.15, "High profit margins"),
+    ("debtToEquity", operator.lt, 1, "Low debt-to-equity ratio (financially healthy)"),
+    ("earningsGrowth", operator.gt, 0.05, "Positive earnings growth"),
+    ("revenueGrowth", operator.gt, 0.05, "Positive revenue growth"),
+    ("currentRatio", operator.gt, 1.5, "Strong liquidity (high current ratio)"),
+    ("dividendYield", operator.gt, 0.02, "Attractive dividend yield"),
+    ("beta", operator.lt, 1, "Low beta (less volatile than market)"),
+)
+CON_RULES = (
+    ("trailingPE", operator.gt, 40, "High trailing P/E ratio (may indicate overvaluation)"),
+    ("profitMargins", operator.lt, 0.05, "Low profit margins"),
+    ("debtToEquity", operator.gt, 2, "High debt-to-equity ratio (financial risk)"),
+    ("earningsGrowth", operator.lt, 0, "Negative earnings growth"),
+    ("revenueGrowth", operator.lt, 0, "Negative revenue growth"),
+    ("currentRatio", operator.lt, 1, "Low current ratio (liquidity risk)"),
+    ("beta", operator.gt, 2, "High beta (stock is very volatile)"),
+)
+
+
+def _matching_rules(rules, info: Dict) -> List[str]:
+    """Messages of the rules whose metric is reported and passes its threshold"""
+    messages = []
+    for key, compare, threshold, message in rules:
+        value = info.get(key)
+        if value is not None and compare(value, threshold):
+            messages.append(message)
+    return messages
+
+
+@cached(TTLCache(maxsize=512, ttl=FUNDAMENTALS_TTL), lock=threading.Lock())
+def summarize_fundamentals(symbol: str) -> Dict:
+    """Key ratios from ticker.info plus rule-based pros and cons
+
+    Summaries are memoized per symbol for FUNDAMENTALS_TTL seconds;
+    callers must not modify the returned dict.
+    """
+    info = fetch_info(symbol)
+    pros = _matching_rules(PRO_RULES, info)
+    cons = _matching_rules(CON_RULES, info)
+    return {
+        "symbol": symbol,
+        "longName": info.get("longName"),
+        "sector": info.get("sector"),
+        "industry": info.get("industry"),
+        "marketCap": info.get("marketCap"),
+        "trailingPE": info.get("trailingPE"),
+        "forwardPE": info.get("forwardPE"),
+        "dividendYield": info.get("dividendYield"),
+        "earningsGrowth": info.get("earningsGrowth"),
+        "revenueGrowth": info.get("revenueGrowth"),
+        "profitMargins": info.get("profitMargins"),
+        "returnOnEquity": info.get("returnOnEquity"),
+        "returnOnAssets": info.get("returnOnAssets"),
+        "debtToEquity": info.get("debtToEquity"),
+        "currentRatio": info.get("currentRatio"),
+        "quickRatio": info.get("quickRatio"),
+        "beta": info.get("beta"),
+        "website": info.get("website"),
+        "pros": pros,
+        "cons": cons,
+    }
@@ -0,0 +1,195 @@
+import hashlib
+import os
+import threading
+import time
+from typing import Dict, List, NamedTuple
+
+import pandas as pd
+import yfinance as yf
+from cachetools import TTLCache
+
+# On-disk cache directory, so downloaded history survives restarts
+CACHE_DIR = os.environ.get("MARKET_DATA_CACHE_DIR", "cache")
+
+HISTORY_TTL = 15 * 60  # Seconds raw history is served from memory
+HISTORY_DISK_TTL = 24 * 60 * 60  # Seconds daily+ raw history is served from disk
+INFO_TTL = 5 * 60  # Seconds ticker.info is served from memory
+
+_history_cache = TTLCache(maxsize=512, ttl=HISTORY_TTL)
+_info_cache = TTLCache(maxsize=512, ttl=INFO_TTL)
+_cache_lock = threading.Lock()
+
+
+class RawHistory(NamedTuple):
+    """Unadjusted OHLCV history downloaded for the dates [start, end)
+
+    downloaded is the time.time() of the full download the range was
+    built from; Yahoo's split-adjusted Close and its Adj Close are only
+    consistent with bars fetched at the same time.
+    """
+    start: pd.Timestamp
+    end: pd.Timestamp
+    data: pd.DataFrame
+    downloaded: float = 0.0
+
+
+def _disk_path(key: tuple) -> str:
+    digest = hashlib.sha1(repr(key).encode()).hexdigest()
+    return os.path.join(CACHE_DIR, f"history_{digest}.pkl")
+
+
+def _is_intraday(interval: str) -> bool:
+    return interval.endswith(("m", "h")) and not interval.endswith("mo")
+
+
+def _read_disk(key: tuple):
+    # Intraday bars go stale within the day, so they expire with memory
+    ttl = HISTORY_TTL if _is_intraday(key[1]) else HISTORY_DISK_TTL
+    path = _disk_path(key)
+    try:
+        if time.time() - os.path.getmtime(path) < ttl:
+            return pd.read_pickle(path)
+    except (OSError, ValueError):
+        pass
+    return None
+
+
+def _write_disk(key: tuple, history: RawHistory):
+    try:
+        os.makedirs(CACHE_DIR, exist_ok=True)
+        path = _disk_path(key)
+        pd.to_pickle(history, path + ".tmp")
+        os.replace(path + ".tmp", path)
+    except OSError:
+        pass  # The disk cache is best effort
+
+
+def _adjust(raw: pd.DataFrame) -> pd.DataFrame:
+    """Apply the Adj Close / Close ratio to the OHLC prices
+
+    Same result as yfinance's auto_adjust=True: Close is replaced by
+    Adj Close and Open/High/Low are scaled by the same per-bar ratio.
+    """
+    if "Adj Close" not in raw.columns:
+        return raw.copy()
+    data = raw.drop(columns="Adj Close")
+    ratio = (raw["Adj Close"] / raw["Close"]).to_numpy()
+    data[["Open", "High", "Low"]] = raw[["Open", "High", "Low"]].to_numpy() * ratio[:, None]
+    data["Close"] = raw["Adj Close"]
+    return data
+
+
+def _to_index_tz(ts: pd.Timestamp, index: pd.Index) -> pd.Timestamp:
+    tz = getattr(index, "tz", None)
+    return ts.tz_localize(tz) if tz is not None else ts
+
+
+def _download(symbol: str, start: pd.Timestamp, end: pd.Timestamp, interval: str) -> pd.DataFrame:
+    return yf.Ticker(symbol).history(
+        start=start,
+        end=end,
+        interval=interval,
+        auto_adjust=False,
+        back_adjust=False,
+    )
+
+
+def _has_corporate_actions(raw: pd.DataFrame) -> bool:
+    """Whether a download contains a split or dividend"""
+    actions = raw.columns.intersection(["Dividends", "Stock Splits"])
+    return bool(raw[actions].to_numpy().any())
+
+
+def _store(key: tuple, history: RawHistory) -> RawHistory:
+    _write_disk(key, history)
+    with _cache_lock:
+        _history_cache[key] = history
+    return history
+
+
+def fetch_history(symbol: str, start: str, end: str, interval: str) -> pd.DataFrame:
+    """Adjusted OHLCV history for a symbol between start (inclusive) and end
+
+    Raw (unadjusted) bars are downloaded once per (symbol, interval) and
+    kept in memory for HISTORY_TTL seconds and in CACHE_DIR for
+    HISTORY_DISK_TTL seconds (HISTORY_TTL for intraday intervals). The
+    cached range ends at the download time at the latest. Requests inside
+    it are sliced and adjusted locally; a request reaching past either end
+    downloads only the missing bars, and one disjoint from it replaces it.
+    The range is downloaded in full again once its first download is
+    HISTORY_DISK_TTL old, or when the missing bars carry a split or
+    dividend.
+    Callers get a fresh frame and may modify it freely.
+    """
+    key = (symbol, interval)
+    start_ts, end_ts = pd.Timestamp(start), pd.Timestamp(end)
+    now = pd.Timestamp.now()
+
+    with _cache_lock:
+        history = _history_cache.get(key)
+    if history is None:
+        history = _read_disk(key)
+        if history is not None:
+            with _cache_lock:
+                _history_cache[key] = history
+
+    # Extensions keep the cached bars alive, so their prices are only
+    # trusted for a day from the download they came from
+    if history is not None and time.time() - history.downloaded >= HISTORY_DISK_TTL:
+        history = None
+
+    # Bars after the download time are only fetched once they are
+    # HISTORY_TTL old, so requests ending today don't all go to Yahoo
+    wanted_end = min(end_ts, now - pd.Timedelta(seconds=HISTORY_TTL))
+
+    extend = history is not None and not (start_ts > history.end or end_ts < history.start)
+    if extend and (start_ts < history.start or wanted_end > history.end):
+        head = tail = None
+        if start_ts < history.start:
+            head = _download(symbol, start_ts, history.start, interval)
+        if wanted_end > history.end:
+            tail = _download(symbol, history.end, end_ts, interval)
+        new_parts = [part for part in (head, tail) if part is not None and not part.empty]
+        if any(_has_corporate_actions(part) for part in new_parts):
+            # A split or dividend the cached bars may predate re-bases
+            # Yahoo's prices, so they might not line up with the new ones
+            extend = False
+        else:
+            raw = pd.concat([history.data, *new_parts])
+            raw = raw[~raw.index.duplicated(keep="last")].sort_index()
+            history = _store(key, history._replace(
+                start=min(start_ts, history.start),
+                end=max(min(end_ts, now), history.end),
+                data=raw,
+            ))
+
+    if not extend:
+        downloaded = time.time()
+        raw = _download(symbol, start_ts, end_ts, interval)
+        if raw.empty:
+            return raw
+        history = _store(key, RawHistory(start_ts, min(end_ts, now), raw, downloaded))
+
+    raw = history.data
+    mask = (raw.index >= _to_index_tz(pd.Timestamp(start), raw.index)) & (
+        raw.index < _to_index_tz(pd.Timestamp(end), raw.index)
+    )
+    return _adjust(raw[mask])
+
+
+def fetch_info(symbol: str) -> Dict:
+    """ticker.info for a symbol, memoized in memory for INFO_TTL seconds"""
+    with _cache_lock:
+        info = _info_cache.get(symbol)
+
+    if info is None:
+        info = yf.Ticker(symbol).info
+        with _cache_lock:
+            _info_cache[symbol] = info
+
+    return info
+
+
+def fetch_news(symbol: str) -> List[Dict]:
+    """Latest ticker.news items for a symbol (empty list when there are none)"""
+    return yf.Ticker(symbol).news or []
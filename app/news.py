@@ -0,0 +1,66 @@
+import heapq
+import threading
+from typing import Dict, List
+
+from cachetools import TTLCache, cached
+
+from .market_data import fetch_news
+
+NEWS_TTL = 5 * 60  # Seconds a news digest is reused
+
+
+def _publish_time(item) -> int:
+    """Sort key for news items; malformed items and missing times rank last"""
+    return (item.get("providerPublishTime") or 0) if isinstance(item, dict) else 0
+
+
+@cached(TTLCache(maxsize=512, ttl=NEWS_TTL), lock=threading.Lock())
+def get_latest_news(symbol: str, limit: int = 5) -> List[Dict]:
+    """The `limit` most recent news items for a symbol, flattened for the frontend
+
+    Digests are memoized per (symbol, limit) for NEWS_TTL seconds; callers
+    must not modify the returned list.
+    """
+    news = fetch_news(symbol)
+    # Get the latest items (partial heap selection, not a full sort)
+    top_news = heapq.nlargest(limit, news, key=_publish_time)
+    flat_news = []
+    for n in top_news:
+        if not isinstance(n, dict):
+            continue
+        content = n.get("content") or {}
+        # Defensive: ensure content is a dict
+        if not isinstance(content, dict):
+            content = {}
+        title = content.get("title") or n.get("title") or "No Title"
+        # Defensive: canonicalUrl/clickThroughUrl may be dict or None
+        canonical_url = content.get("canonicalUrl") or {}
+        click_url = content.get("clickThroughUrl") or {}
+        link = canonical_url.get("url") if isinstance(canonical_url, dict) else None
+        if not link:
+            link = click_url.get("url") if isinstance(click_url, dict) else None
+        if not link:
+            link = n.get("link") or ""
+        provider = content.get("provider") or {}
+        publisher = (
+            provider.get("displayName") if isinstance(provider, dict) else None
+        )
+        if not publisher:
+            publisher = n.get("publisher") or "Unknown"
+        pub_time = content.get("pubDate") or n.get("providerPublishTime") or ""
+        summary = content.get("summary") or n.get("summary") or ""
+        thumbnail = content.get("thumbnail") or {}
+        thumbnail_url = (
+            thumbnail.get("originalUrl") if isinstance(thumbnail, dict) else None
+        )
+        flat_news.append(
+            {
+                "title": title,
+                "link": link,
+                "publisher": publisher,
+                "providerPublishTime": pub_time,
+                "summary": summary,
+                "thumbnail": thumbnail_url,
+            }
+        )
+    return flat_news
@@ -5,6 +5,9 @@ import numpy as np
 class BaseStrategy(ABC):
     """Base class for all trading strategies"""
     
+    # Leading bars dropped from the signals while indicators warm up
+    warmup_period = 0
+    
     def __init__(self, name: str):
         self.name = name
     
@@ -13,6 +16,25 @@ class BaseStrategy(ABC):
         """Generate buy/sell signals based on the strategy logic"""
         pass
     
+    def generate_signals_from_arrays(self, close: np.ndarray,
+                                     volume: np.ndarray = None) -> np.ndarray:
+        """Generate the int8 signal array straight from price/volume arrays
+        
+        Used by parameter sweeps, which extract the arrays once and reuse them
+        for every combination. Returns one signal per bar, warm-up included;
+        callers drop the first `warmup_period` bars.
+        """
+        raise NotImplementedError(f"{self.name} does not support array signals")
+    
+    def generate_signals_batch(self, closes: pd.DataFrame) -> pd.DataFrame:
+        """Generate signals for several symbols at once
+        
+        `closes` holds one close price column per symbol; the result has the
+        same columns with an int8 signal per bar. Only strategies driven by
+        close prices alone can implement this.
+        """
+        raise NotImplementedError(f"{self.name} does not support batch signals")
+    
     def prepare_data(self, data: pd.DataFrame) -> pd.DataFrame:
         """Prepare and clean the data for strategy calculation"""
         # Ensure we have the required columns
@@ -21,7 +43,7 @@ class BaseStrategy(ABC):
             if col not in data.columns:
                 raise ValueError(f"Missing required column: {col}")
         
-        # Forward fill any missing values (updated method)
-        data = data.fillna(method='ffill').fillna(method='bfill')
+        # Forward fill any missing values, then back fill the leading gap
+        data = data.ffill().bfill()
         
         return data
@@ -1,6 +1,7 @@
 import pandas as pd
 import numpy as np
 from .base_strategy import BaseStrategy
+from .indicators import moving_mean_std, rolling_mean_std_2d
 
 class BollingerBandStrategy(BaseStrategy):
     """Bollinger Band Strategy"""
@@ -10,26 +11,58 @@ class BollingerBandStrategy(BaseStrategy):
         self.period = period
         self.std_dev = std_dev
     
+    @property
+    def warmup_period(self) -> int:
+        """Leading bars where the bands are still undefined"""
+        return self.period - 1
+    
     def generate_signals(self, data: pd.DataFrame) -> pd.DataFrame:
         """Generate signals based on Bollinger Bands"""
-        data = data.copy()
+        close = data['close'].to_numpy(dtype=np.float64)
+        signals = pd.DataFrame({'close': close, **self._indicators(close)}, index=data.index)
+        
+        # Skip the warm-up rows where the bands are still undefined
+        return signals.iloc[self.warmup_period:]
+    
+    def generate_signals_from_arrays(self, close: np.ndarray,
+                                     volume: np.ndarray = None) -> np.ndarray:
+        """Generate Bollinger Band signals straight from the close array"""
+        return self._indicators(close)['signal']
+    
+    def generate_signals_batch(self, closes: pd.DataFrame) -> pd.DataFrame:
+        """Generate Bollinger Band signals for several symbols at once"""
+        close = closes.to_numpy(dtype=np.float64)
+        
+        # Calculate Bollinger Bands for every symbol in parallel
+        ma, std = rolling_mean_std_2d(close, self.period)
+        signal = self._band_signals(close, ma - (std * self.std_dev), ma + (std * self.std_dev))
         
+        signals = pd.DataFrame(signal, index=closes.index, columns=closes.columns)
+        return signals.iloc[self.warmup_period:]
+    
+    def _indicators(self, close: np.ndarray) -> dict:
+        """Bollinger Bands and signals as arrays"""
         # Calculate Bollinger Bands
-        data['ma'] = data['close'].rolling(window=self.period).mean()
-        data['std'] = data['close'].rolling(window=self.period).std()
-        data['upper_band'] = data['ma'] + (data['std'] * self.std_dev)
-        data['lower_band'] = data['ma'] - (data['std'] * self.std_dev)
+        ma, std = moving_mean_std(close, self.period)
+        upper_band = ma + (std * self.std_dev)
+        lower_band = ma - (std * self.std_dev)
         
         # Generate signals
-        data['signal'] = 0
+        signal = self._band_signals(close, lower_band, upper_band)
         
+        return {
+            'ma': ma,
+            'std': std,
+            'upper_band': upper_band,
+            'lower_band': lower_band,
+            'signal': signal
+        }
+    
+    def _band_signals(self, close: np.ndarray, lower_band: np.ndarray,
+                      upper_band: np.ndarray) -> np.ndarray:
+        """Band-touch signals, element-wise for one or many symbols"""
         # Buy signal: price touches lower band
-        data.loc[data['close'] <= data['lower_band'], 'signal'] = 1
-        
-        # Sell signal: price touches upper band
-        data.loc[data['close'] >= data['upper_band'], 'signal'] = -1
-        
-        # Remove rows with insufficient data
-        data = data.dropna()
-        
-        return data
+        # Sell signal: price touches upper band (takes precedence)
+        return np.select(
+            [close >= upper_band, close <= lower_band], [-1, 1], default=0
+        ).astype(np.int8)
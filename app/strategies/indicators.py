@@ -0,0 +1,273 @@
+import numpy as np
+
+try:
+    import bottleneck as bn
+except ImportError:
+    bn = None
+
+from ..jit import NUMBA_AVAILABLE, njit, prange
+
+
+def moving_mean(x: np.ndarray, window: int) -> np.ndarray:
+    """Rolling mean, NaN until the window holds `window` values
+
+    Runs the compiled rolling_mean_std kernel, or bottleneck's C
+    implementation when Numba is not installed.
+    """
+    if not NUMBA_AVAILABLE and bn is not None:
+        return bn.move_mean(x, window, min_count=window)
+    return rolling_mean(x, window)
+
+
+def moving_mean_std(x: np.ndarray, window: int):
+    """Rolling mean and sample standard deviation (see moving_mean)"""
+    if not NUMBA_AVAILABLE and bn is not None:
+        return (bn.move_mean(x, window, min_count=window),
+                bn.move_std(x, window, min_count=window, ddof=1))
+    return rolling_mean_std(x, window)
+
+
+def pct_change(x: np.ndarray, periods: int) -> np.ndarray:
+    """Relative change over `periods` bars, NaN for the first `periods` bars"""
+    out = np.full(len(x), np.nan)
+    if 0 < periods < len(x):
+        out[periods:] = x[periods:] / x[:-periods] - 1
+    return out
+
+
+@njit(cache=True, nogil=True)
+def rolling_mean(x, window):
+    """Rolling mean from a running window sum
+
+    Applies V[t] = V[t-1] + x[t] - x[t-window] with Kahan compensation, so
+    each bar costs one add and one subtract whatever the window length and
+    rounding error does not accumulate over long series. Like
+    rolling_mean_std, a result is only emitted once the window holds
+    `window` non-NaN values.
+    """
+    n = x.shape[0]
+    out = np.full(n, np.nan)
+
+    count = 0
+    total = 0.0
+    comp = 0.0
+
+    for i in range(n):
+        # Add the value entering the window
+        value = x[i]
+        if not np.isnan(value):
+            count += 1
+            y = value - comp
+            t = total + y
+            comp = (t - total) - y
+            total = t
+
+        # Remove the value leaving the window
+        if i >= window:
+            old = x[i - window]
+            if not np.isnan(old):
+                count -= 1
+                y = -old - comp
+                t = total + y
+                comp = (t - total) - y
+                total = t
+
+        if count == window:
+            out[i] = total / window
+
+    return out
+
+
+@njit(cache=True, nogil=True)
+def rolling_mean_std(x, window):
+    """Rolling mean and sample standard deviation in a single pass
+
+    Keeps Welford accumulators for the current window and updates them as
+    values enter and leave it, so each bar costs O(1) whatever the window
+    length. Matches pandas' rolling(window).mean()/.std(): a result is only
+    emitted once the window holds `window` non-NaN values.
+    """
+    n = x.shape[0]
+    mean_out = np.full(n, np.nan)
+    std_out = np.full(n, np.nan)
+
+    count = 0
+    mean = 0.0
+    m2 = 0.0
+
+    for i in range(n):
+        # Add the value entering the window
+        value = x[i]
+        if not np.isnan(value):
+            count += 1
+            delta = value - mean
+            mean += delta / count
+            m2 += delta * (value - mean)
+
+        # Remove the value leaving the window
+        if i >= window:
+            old = x[i - window]
+            if not np.isnan(old):
+                count -= 1
+                if count == 0:
+                    mean = 0.0
+                    m2 = 0.0
+                else:
+                    delta = old - mean
+                    mean -= delta / count
+                    m2 -= delta * (old - mean)
+
+        if count == window:
+            mean_out[i] = mean
+            if window > 1:
+                std_out[i] = np.sqrt(max(m2, 0.0) / (window - 1))
+
+    return mean_out, std_out
+
+
+@njit(cache=True, nogil=True)
+def rsi_wilder(close, period):
+    """Relative Strength Index with Wilder's smoothing in a single pass
+
+    The average gain/loss are seeded with the simple mean of the first
+    `period` price changes and then updated as
+    avg = (avg * (period - 1) + value) / period. The first `period` entries
+    are NaN, as is any bar where both averages are zero (flat prices).
+    """
+    n = close.shape[0]
+    rsi = np.full(n, np.nan)
+
+    avg_gain = 0.0
+    avg_loss = 0.0
+
+    for i in range(1, n):
+        change = close[i] - close[i - 1]
+        gain = change if change > 0 else 0.0
+        loss = -change if change < 0 else 0.0
+
+        if i < period:
+            avg_gain += gain
+            avg_loss += loss
+            continue
+        elif i == period:
+            avg_gain = (avg_gain + gain) / period
+            avg_loss = (avg_loss + loss) / period
+        else:
+            avg_gain = (avg_gain * (period - 1) + gain) / period
+            avg_loss = (avg_loss * (period - 1) + loss) / period
+
+        if avg_loss == 0.0:
+            if avg_gain > 0.0:
+                rsi[i] = 100.0
+        else:
+            rsi[i] = 100.0 - 100.0 / (1.0 + avg_gain / avg_loss)
+
+    return rsi
+
+
+@njit(cache=True, nogil=True)
+def _ewm_update(weighted, old_wt, value, decay):
+    """One step of pandas' ewm(adjust=True).mean() recurrence"""
+    if weighted == weighted:
+        old_wt *= decay
+        if value == value:
+            if weighted != value:
+                weighted = (old_wt * weighted + value) / (old_wt + 1.0)
+            old_wt += 1.0
+    elif value == value:
+        weighted = value
+    return weighted, old_wt
+
+
+@njit(cache=True, nogil=True)
+def macd_signals(close, fast_period, slow_period, signal_period):
+    """MACD line, signal line, histogram and crossover signals in a single pass
+
+    Updates the fast, slow and signal EMAs in lockstep (same weighting as
+    pandas' ewm(span=...).mean()) and emits 1 when the histogram turns
+    positive (MACD crosses above the signal line), -1 when it turns negative
+    and 0 otherwise.
+    """
+    n = close.shape[0]
+    macd = np.empty(n)
+    signal_line = np.empty(n)
+    histogram = np.empty(n)
+    signals = np.zeros(n, dtype=np.int8)
+    if n == 0:
+        return macd, signal_line, histogram, signals
+
+    # Decay factors, derived from the span the same way pandas does
+    decay_fast = 1.0 - 1.0 / (1.0 + (fast_period - 1) / 2.0)
+    decay_slow = 1.0 - 1.0 / (1.0 + (slow_period - 1) / 2.0)
+    decay_signal = 1.0 - 1.0 / (1.0 + (signal_period - 1) / 2.0)
+
+    ema_fast = close[0]
+    ema_slow = close[0]
+    wt_fast = 1.0
+    wt_slow = 1.0
+    macd[0] = ema_fast - ema_slow
+    ema_signal = macd[0]
+    wt_signal = 1.0
+    signal_line[0] = ema_signal
+    histogram[0] = macd[0] - ema_signal
+
+    for i in range(1, n):
+        ema_fast, wt_fast = _ewm_update(ema_fast, wt_fast, close[i], decay_fast)
+        ema_slow, wt_slow = _ewm_update(ema_slow, wt_slow, close[i], decay_slow)
+        macd[i] = ema_fast - ema_slow
+        ema_signal, wt_signal = _ewm_update(ema_signal, wt_signal, macd[i], decay_signal)
+        signal_line[i] = ema_signal
+
+        # Crossovers are sign changes of the histogram (MACD - signal)
+        hist = macd[i] - ema_signal
+        histogram[i] = hist
+        prev_hist = histogram[i - 1]
+        if hist > 0 and prev_hist <= 0:
+            signals[i] = 1
+        elif hist < 0 and prev_hist >= 0:
+            signals[i] = -1
+
+    return macd, signal_line, histogram, signals
+
+
+# Batch variants: closes is a [n_bars, n_symbols] array and every symbol
+# column is processed on its own thread.
+
+@njit(cache=True, nogil=True, parallel=True)
+def rolling_mean_std_2d(closes, window):
+    """Column-wise rolling_mean_std over a [n_bars, n_symbols] array"""
+    n_bars, n_symbols = closes.shape
+    mean_out = np.empty((n_bars, n_symbols))
+    std_out = np.empty((n_bars, n_symbols))
+    for j in prange(n_symbols):
+        mean, std = rolling_mean_std(closes[:, j], window)
+        mean_out[:, j] = mean
+        std_out[:, j] = std
+    return mean_out, std_out
+
+
+@njit(cache=True, nogil=True, parallel=True)
+def rsi_wilder_2d(closes, period):
+    """Column-wise rsi_wilder over a [n_bars, n_symbols] array"""
+    n_bars, n_symbols = closes.shape
+    rsi = np.empty((n_bars, n_symbols))
+    for j in prange(n_symbols):
+        rsi[:, j] = rsi_wilder(closes[:, j], period)
+    return rsi
+
+
+@njit(cache=True, nogil=True, parallel=True)
+def macd_signals_2d(closes, fast_period, slow_period, signal_period):
+    """Column-wise macd_signals over a [n_bars, n_symbols] array"""
+    n_bars, n_symbols = closes.shape
+    macd = np.empty((n_bars, n_symbols))
+    signal_line = np.empty((n_bars, n_symbols))
+    histogram = np.empty((n_bars, n_symbols))
+    signals = np.empty((n_bars, n_symbols), dtype=np.int8)
+    for j in prange(n_symbols):
+        m, s, h, sig = macd_signals(closes[:, j], fast_period, slow_period, signal_period)
+        macd[:, j] = m
+        signal_line[:, j] = s
+        histogram[:, j] = h
+        signals[:, j] = sig
+    return macd, signal_line, histogram, signals
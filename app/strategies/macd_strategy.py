@@ -1,4 +1,5 @@
 from .base_strategy import BaseStrategy
+from .indicators import macd_signals, macd_signals_2d
 import pandas as pd
 import numpy as np
 
@@ -19,30 +20,34 @@ class MACDStrategy(BaseStrategy):
     
     def generate_signals(self, data: pd.DataFrame) -> pd.DataFrame:
         """Generate trading signals based on MACD crossover"""
-        data = data.copy()
+        close = data['close'].to_numpy(dtype=np.float64)
         
-        # Calculate MACD
-        exp1 = data['close'].ewm(span=self.fast_period).mean()
-        exp2 = data['close'].ewm(span=self.slow_period).mean()
-        macd_line = exp1 - exp2
-        signal_line = macd_line.ewm(span=self.signal_period).mean()
-        histogram = macd_line - signal_line
+        # Calculate MACD and crossover signals in one pass
+        macd_line, signal_line, histogram, signals = macd_signals(
+            close, self.fast_period, self.slow_period, self.signal_period
+        )
         
-        # Add technical indicators to data
-        data['macd'] = macd_line
-        data['macd_signal'] = signal_line
-        data['macd_histogram'] = histogram
-        
-        # Generate signals
-        data['signal'] = 0
-        
-        # Buy when MACD crosses above signal line
-        data.loc[(macd_line > signal_line) & (macd_line.shift(1) <= signal_line.shift(1)), 'signal'] = 1
-        
-        # Sell when MACD crosses below signal line
-        data.loc[(macd_line < signal_line) & (macd_line.shift(1) >= signal_line.shift(1)), 'signal'] = -1
-        
-        return data
+        # Buy when MACD crosses above signal line, sell when it crosses below
+        return pd.DataFrame({
+            'close': close,
+            'macd': macd_line,
+            'macd_signal': signal_line,
+            'macd_histogram': histogram,
+            'signal': signals
+        }, index=data.index)
+    
+    def generate_signals_from_arrays(self, close: np.ndarray,
+                                     volume: np.ndarray = None) -> np.ndarray:
+        """Generate MACD crossover signals straight from the close array"""
+        return macd_signals(close, self.fast_period, self.slow_period, self.signal_period)[3]
+    
+    def generate_signals_batch(self, closes: pd.DataFrame) -> pd.DataFrame:
+        """Generate MACD crossover signals for several symbols at once"""
+        signals = macd_signals_2d(
+            closes.to_numpy(dtype=np.float64),
+            self.fast_period, self.slow_period, self.signal_period
+        )[3]
+        return pd.DataFrame(signals, index=closes.index, columns=closes.columns)
     
     def get_parameters(self):
         """Return strategy parameters for optimization"""
@@ -1,6 +1,7 @@
 import pandas as pd
 import numpy as np
 from .base_strategy import BaseStrategy
+from .indicators import moving_mean
 
 class MovingAverageCrossover(BaseStrategy):
     """Moving Average Crossover Strategy"""
@@ -10,25 +11,35 @@ class MovingAverageCrossover(BaseStrategy):
         self.fast_period = fast_period
         self.slow_period = slow_period
     
+    @property
+    def warmup_period(self) -> int:
+        """Leading bars where the slower average is still undefined"""
+        return max(self.fast_period, self.slow_period) - 1
+    
     def generate_signals(self, data: pd.DataFrame) -> pd.DataFrame:
         """Generate signals based on moving average crossover"""
-        print("THIS IS THE FAST PERIOD AND SLOW PERIOS",self.fast_period, self.slow_period)
-        data = data.copy()
+        close = data['close'].to_numpy(dtype=np.float64)
+        signals = pd.DataFrame({'close': close, **self._indicators(close)}, index=data.index)
         
+        # Skip the warm-up rows where the slower average is still undefined
+        return signals.iloc[self.warmup_period:]
+    
+    def generate_signals_from_arrays(self, close: np.ndarray,
+                                     volume: np.ndarray = None) -> np.ndarray:
+        """Generate crossover signals straight from the close array"""
+        return self._indicators(close)['signal']
+    
+    def _indicators(self, close: np.ndarray) -> dict:
+        """Moving averages and crossover signals as arrays"""
         # Calculate moving averages
-        data['ma_fast'] = data['close'].rolling(window=self.fast_period).mean()
-        data['ma_slow'] = data['close'].rolling(window=self.slow_period).mean()
+        ma_fast = moving_mean(close, self.fast_period)
+        ma_slow = moving_mean(close, self.slow_period)
         
         # Generate signals
-        data['signal'] = 0
-        
         # Buy signal: fast MA crosses above slow MA
-        data.loc[data['ma_fast'] > data['ma_slow'], 'signal'] = 1
-        
-        # Sell signal: fast MA crosses below slow MA  
-        data.loc[data['ma_fast'] < data['ma_slow'], 'signal'] = -1
-        
-        # Remove rows with insufficient data
-        data = data.dropna()
+        # Sell signal: fast MA crosses below slow MA
+        signal = np.select(
+            [ma_fast < ma_slow, ma_fast > ma_slow], [-1, 1], default=0
+        ).astype(np.int8)
         
-        return data
+        return {'ma_fast': ma_fast, 'ma_slow': ma_slow, 'signal': signal}
@@ -1,6 +1,7 @@
 import pandas as pd
 import numpy as np
 from .base_strategy import BaseStrategy
+from .indicators import rsi_wilder, rsi_wilder_2d
 
 class RSIMeanReversion(BaseStrategy):
     """RSI Mean Reversion Strategy"""
@@ -12,31 +13,49 @@ class RSIMeanReversion(BaseStrategy):
         self.overbought = overbought
     
     def calculate_rsi(self, prices: pd.Series, period: int) -> pd.Series:
-        """Calculate Relative Strength Index"""
-        delta = prices.diff()
-        gain = (delta.where(delta > 0, 0)).rolling(window=period).mean()
-        loss = (-delta.where(delta < 0, 0)).rolling(window=period).mean()
-        rs = gain / loss
-        rsi = 100 - (100 / (1 + rs))
-        return rsi
+        """Calculate Relative Strength Index (Wilder's smoothing)"""
+        rsi = rsi_wilder(prices.to_numpy(dtype=np.float64), period)
+        return pd.Series(rsi, index=prices.index)
+    
+    @property
+    def warmup_period(self) -> int:
+        """Leading bars where RSI is still undefined"""
+        return self.period
     
     def generate_signals(self, data: pd.DataFrame) -> pd.DataFrame:
         """Generate signals based on RSI levels"""
-        data = data.copy()
+        close = data['close'].to_numpy(dtype=np.float64)
         
         # Calculate RSI
-        data['rsi'] = self.calculate_rsi(data['close'], self.period)
+        rsi = self.calculate_rsi(data['close'], self.period).to_numpy()
         
         # Generate signals
-        data['signal'] = 0
-        
-        # Buy signal: RSI < oversold level
-        data.loc[data['rsi'] < self.oversold, 'signal'] = 1
-        
-        # Sell signal: RSI > overbought level
-        data.loc[data['rsi'] > self.overbought, 'signal'] = -1
+        signal = self._level_signals(rsi)
         
-        # Remove rows with insufficient data
-        data = data.dropna()
+        signals = pd.DataFrame({
+            'close': close,
+            'rsi': rsi,
+            'signal': signal
+        }, index=data.index)
         
-        return data
+        # Skip the warm-up rows where RSI is still undefined
+        return signals.iloc[self.warmup_period:]
+    
+    def generate_signals_from_arrays(self, close: np.ndarray,
+                                     volume: np.ndarray = None) -> np.ndarray:
+        """Generate RSI signals straight from the close array"""
+        return self._level_signals(rsi_wilder(close, self.period))
+    
+    def generate_signals_batch(self, closes: pd.DataFrame) -> pd.DataFrame:
+        """Generate RSI signals for several symbols at once"""
+        rsi = rsi_wilder_2d(closes.to_numpy(dtype=np.float64), self.period)
+        signals = pd.DataFrame(self._level_signals(rsi), index=closes.index, columns=closes.columns)
+        return signals.iloc[self.warmup_period:]
+    
+    def _level_signals(self, rsi: np.ndarray) -> np.ndarray:
+        """Oversold/overbought signals, element-wise for one or many symbols"""
+        # Buy signal: RSI < oversold level
+        # Sell signal: RSI > overbought level (takes precedence)
+        return np.select(
+            [rsi > self.overbought, rsi < self.oversold], [-1, 1], default=0
+        ).astype(np.int8)
@@ -1,4 +1,5 @@
 from .base_strategy import BaseStrategy
+from .indicators import moving_mean, pct_change
 import pandas as pd
 import numpy as np
 
@@ -20,41 +21,57 @@ class VolumeMomentumStrategy(BaseStrategy):
     
     def generate_signals(self, data: pd.DataFrame) -> pd.DataFrame:
         """Generate trading signals based on volume-confirmed momentum"""
-        data = data.copy()
-        
+        close = data['close'].to_numpy(dtype=np.float64)
+        volume = data['volume'].to_numpy(dtype=np.float64)
+        return pd.DataFrame({'close': close, **self._indicators(close, volume)}, index=data.index)
+    
+    def generate_signals_from_arrays(self, close: np.ndarray,
+                                     volume: np.ndarray = None) -> np.ndarray:
+        """Generate volume-confirmed momentum signals from close/volume arrays"""
+        if volume is None:
+            raise ValueError(f"{self.name} requires volume data")
+        return self._indicators(close, volume)['signal']
+    
+    def _indicators(self, close: np.ndarray, volume: np.ndarray) -> dict:
+        """Momentum/volume indicators and signals as arrays"""
         # Calculate volume moving average and momentum
-        data['volume_ma'] = data['volume'].rolling(window=self.lookback).mean()
-        data['price_momentum'] = data['close'].pct_change(self.lookback)
-        data['volume_ratio'] = data['volume'] / data['volume_ma']
+        volume_ma = moving_mean(volume, self.lookback)
+        price_momentum = pct_change(close, self.lookback)
+        with np.errstate(divide='ignore', invalid='ignore'):
+            volume_ratio = volume / volume_ma
         
         # Calculate short-term momentum for more responsive signals
-        data['short_momentum'] = data['close'].pct_change(5)
-        
-        # Generate signals
-        data['signal'] = 0
+        short_momentum = pct_change(close, 5)
         
         # Buy conditions: positive momentum + high volume + price above MA
-        data['price_ma'] = data['close'].rolling(window=self.lookback).mean()
+        price_ma = moving_mean(close, self.lookback)
         
         buy_condition = (
-            (data['price_momentum'] > self.momentum_threshold) &
-            (data['short_momentum'] > 0) &
-            (data['volume_ratio'] > self.volume_threshold) &
-            (data['close'] > data['price_ma'])
+            (price_momentum > self.momentum_threshold) &
+            (short_momentum > 0) &
+            (volume_ratio > self.volume_threshold) &
+            (close > price_ma)
         )
         
         # Sell conditions: negative momentum + high volume + price below MA
         sell_condition = (
-            (data['price_momentum'] < -self.momentum_threshold) &
-            (data['short_momentum'] < 0) &
-            (data['volume_ratio'] > self.volume_threshold) &
-            (data['close'] < data['price_ma'])
+            (price_momentum < -self.momentum_threshold) &
+            (short_momentum < 0) &
+            (volume_ratio > self.volume_threshold) &
+            (close < price_ma)
         )
         
-        data.loc[buy_condition, 'signal'] = 1
-        data.loc[sell_condition, 'signal'] = -1
+        # Generate signals (sell takes precedence)
+        signal = np.select([sell_condition, buy_condition], [-1, 1], default=0).astype(np.int8)
         
-        return data
+        return {
+            'volume_ma': volume_ma,
+            'price_momentum': price_momentum,
+            'volume_ratio': volume_ratio,
+            'short_momentum': short_momentum,
+            'price_ma': price_ma,
+            'signal': signal
+        }
     
     def get_parameters(self):
         """Return strategy parameters for optimization"""
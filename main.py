@@ -1,18 +1,109 @@
 from fastapi import FastAPI, HTTPException
+from fastapi.concurrency import run_in_threadpool
 from fastapi.middleware.cors import CORSMiddleware
-from pydantic import BaseModel
+from fastapi.responses import ORJSONResponse, Response, StreamingResponse
+from pydantic import BaseModel, Field
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from contextlib import asynccontextmanager
 from typing import Dict, List
-import yfinance as yf
+import logging
+import math
+import os
+import threading
+import numpy as np
+import orjson
+import pandas as pd
 
 from app.strategies.moving_average import MovingAverageCrossover
 from app.strategies.rsi_strategy import RSIMeanReversion
 from app.strategies.bollinger_bands import BollingerBandStrategy
 from app.strategies.macd_strategy import MACDStrategy
 from app.strategies.volume_momentum import VolumeMomentumStrategy
-from app.backtester.engine import BacktestEngine
+from app.backtester.engine import BacktestEngine, MarketArrays, process_pool
 from app.backtester.metrics import PerformanceMetrics
+from app.fundamentals import FUNDAMENTALS_TTL, summarize_fundamentals
+from app.market_data import fetch_history
+from app.news import NEWS_TTL, get_latest_news
+
+logger = logging.getLogger(__name__)
+
+
+def warm_up_strategies():
+    """Backtest every registered strategy on a small synthetic series
+
+    Compiles the Numba kernels (or loads them from the on-disk cache) at
+    startup instead of on the first user request.
+    """
+    index = pd.date_range("2000-01-03", periods=256, freq="B")
+    close = 100 + 10 * np.sin(np.linspace(0, 8 * np.pi, len(index)))
+    data = pd.DataFrame(
+        {
+            "open": close,
+            "high": close * 1.01,
+            "low": close * 0.99,
+            "close": close,
+            "volume": np.linspace(1e5, 2e5, len(index)),
+        },
+        index=index,
+    )
+    engine = BacktestEngine()
+    for strategy_id in STRATEGY_REGISTRY:
+        engine.run_backtest(data, build_strategy(strategy_id, {}))
+
+
+def grid_workers() -> int:
+    """Size of this web worker's grid pool
+
+    GRID_WORKERS when set, otherwise an equal share of the cores among the
+    WEB_CONCURRENCY web workers.
+    """
+    if "GRID_WORKERS" in os.environ:
+        return max(1, int(os.environ["GRID_WORKERS"]))
+    web_workers = max(1, int(os.environ.get("WEB_CONCURRENCY", 1)))
+    return max(1, (os.cpu_count() or 1) // web_workers)
+
+
+_grid_executor_lock = threading.Lock()
+
+
+def get_grid_executor(broken: ProcessPoolExecutor = None) -> ProcessPoolExecutor:
+    """Process pool shared by /api/optimize requests, created on first use
+
+    Passing the pool a request found broken (a worker died) replaces it,
+    unless another request already did.
+    """
+    with _grid_executor_lock:
+        executor = app.state.grid_executor
+        if executor is None or executor is broken:
+            if executor is not None:
+                executor.shutdown(wait=False, cancel_futures=True)
+            executor = app.state.grid_executor = process_pool(
+                grid_workers(), initializer=warm_up_strategies
+            )
+        return executor
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    await run_in_threadpool(warm_up_strategies)
+
+    # Pool for /api/optimize, started by the first grid search so web
+    # workers that never optimize don't carry idle processes
+    app.state.grid_executor = None
+    try:
+        yield
+    finally:
+        if app.state.grid_executor is not None:
+            app.state.grid_executor.shutdown(cancel_futures=True)
 
-app = FastAPI(title="Professional Backtesting Platform", version="1.0.0")
+
+app = FastAPI(
+    title="Professional Backtesting Platform",
+    version="1.0.0",
+    default_response_class=ORJSONResponse,
+    lifespan=lifespan,
+)
 
 # Enable CORS for frontend communication
 app.add_middleware(
@@ -27,6 +118,210 @@ app.add_middleware(
 )
 
 
+# Strategy id -> implementing class and the parameter schema served by
+# /api/strategies; backtest defaults come from the same schema
+STRATEGY_REGISTRY = {
+    "moving_average_crossover": {
+        "class": MovingAverageCrossover,
+        "name": "Moving Average Crossover",
+        "description": "Buy when fast MA crosses above slow MA, sell when crosses below",
+        "parameters": {
+            "fast_period": {"type": "int", "default": 10, "min": 5, "max": 50},
+            "slow_period": {"type": "int", "default": 30, "min": 20, "max": 200},
+        },
+    },
+    "rsi_mean_reversion": {
+        "class": RSIMeanReversion,
+        "name": "RSI Mean Reversion",
+        "description": "Buy when RSI < oversold, sell when RSI > overbought",
+        "parameters": {
+            "period": {"type": "int", "default": 14, "min": 5, "max": 30},
+            "oversold": {"type": "int", "default": 30, "min": 10, "max": 40},
+            "overbought": {"type": "int", "default": 70, "min": 60, "max": 90},
+        },
+    },
+    "bollinger_bands": {
+        "class": BollingerBandStrategy,
+        "name": "Bollinger Band Breakout",
+        "description": "Buy on lower band touch, sell on upper band touch",
+        "parameters": {
+            "period": {"type": "int", "default": 20, "min": 10, "max": 50},
+            "std_dev": {"type": "float", "default": 2.0, "min": 1.0, "max": 3.0},
+        },
+    },
+    "macd_strategy": {
+        "class": MACDStrategy,
+        "name": "MACD Crossover",
+        "description": "Buy when MACD crosses above signal line, sell when crosses below",
+        "parameters": {
+            "fast_period": {"type": "int", "default": 12, "min": 5, "max": 20},
+            "slow_period": {"type": "int", "default": 26, "min": 20, "max": 50},
+            "signal_period": {"type": "int", "default": 9, "min": 5, "max": 15},
+        },
+    },
+    "volume_momentum": {
+        "class": VolumeMomentumStrategy,
+        "name": "Volume Momentum",
+        "description": "Volume-confirmed momentum strategy",
+        "parameters": {
+            "lookback": {"type": "int", "default": 20, "min": 10, "max": 50},
+            "volume_threshold": {
+                "type": "float",
+                "default": 1.5,
+                "min": 1.0,
+                "max": 3.0,
+            },
+            "momentum_threshold": {
+                "type": "float",
+                "default": 0.02,
+                "min": 0.01,
+                "max": 0.05,
+            },
+        },
+    },
+}
+
+# Upper bound on parameter combinations evaluated by one /api/optimize call
+MAX_GRID_COMBINATIONS = 1000
+
+
+def check_parameter(name: str, spec: Dict, value):
+    """Coerce a strategy parameter to its registry type, raising 400 if invalid
+
+    Ints also accept integral floats (20.0); values must lie within the
+    spec's min/max.
+    """
+    if isinstance(value, float) and spec["type"] == "int" and value.is_integer():
+        value = int(value)
+    if (
+        isinstance(value, bool)
+        or not isinstance(value, (int, float))
+        or (spec["type"] == "int" and not isinstance(value, int))
+        or not spec["min"] <= value <= spec["max"]
+    ):
+        raise HTTPException(
+            status_code=400,
+            detail=f"Invalid {name} value {value!r}: expected {spec['type']} "
+            f"between {spec['min']} and {spec['max']}",
+        )
+    return int(value) if spec["type"] == "int" else float(value)
+
+
+def build_strategy(strategy_id: str, parameters: Dict):
+    """Instantiate a registered strategy, filling unset parameters with defaults
+
+    Parameters are checked against the registry schema; ones the strategy
+    does not declare are ignored.
+    """
+    entry = STRATEGY_REGISTRY.get(strategy_id)
+    if entry is None:
+        raise HTTPException(status_code=400, detail=f"Unknown strategy: {strategy_id}")
+    kwargs = {
+        name: check_parameter(name, spec, parameters.get(name, spec["default"]))
+        for name, spec in entry["parameters"].items()
+    }
+    return entry["class"](**kwargs)
+
+
+def validate_grid(strategy_id: str, param_grid: Dict[str, List]) -> Dict[str, List]:
+    """Check grid values against the registry's type and bounds
+
+    Returns the full grid with values coerced to the declared types and
+    parameters left out at their defaults; raises a 400 for a bad value.
+    """
+    return {
+        name: [
+            check_parameter(name, spec, value)
+            for value in param_grid.get(name) or [spec["default"]]
+        ]
+        for name, spec in STRATEGY_REGISTRY[strategy_id]["parameters"].items()
+    }
+
+
+# OHLCV columns every strategy and response needs
+_REQUIRED = frozenset({"open", "high", "low", "close", "volume"})
+
+
+async def load_price_data(
+    symbol: str, start_date: str, end_date: str, interval: str
+) -> pd.DataFrame:
+    """Fetch OHLCV history with lower-cased columns, raising 400 if unusable"""
+    try:
+        # yfinance blocks on network I/O; keep it off the event loop
+        data = await run_in_threadpool(
+            fetch_history, symbol, start_date, end_date, interval
+        )
+    except Exception as e:
+        raise HTTPException(status_code=400, detail=f"{e}")
+
+    if data.empty:
+        logger.warning("No data available for symbol %s", symbol)
+        raise HTTPException(
+            status_code=400, detail=f"No data available for symbol {symbol}"
+        )
+
+    # Standardize column names (yfinance sometimes returns different cases)
+    data.columns = data.columns.str.lower()
+
+    missing = _REQUIRED.difference(data.columns)
+    if missing:
+        raise HTTPException(
+            status_code=400,
+            detail=f"Missing required columns: {', '.join(sorted(missing))}",
+        )
+
+    # Strategies only slice off their indicator warm-up, so bars with a
+    # missing price or volume are dropped here before they reach the
+    # simulation and turn the portfolio value NaN
+    data = data.dropna(subset=sorted(_REQUIRED))
+    if data.empty:
+        raise HTTPException(
+            status_code=400, detail=f"No data available for symbol {symbol}"
+        )
+
+    return data
+
+
+def format_dates(index: pd.Index, unit: str = "D") -> np.ndarray:
+    """Format timestamps as ISO strings ("D": YYYY-MM-DD, "M": YYYY-MM)
+
+    Formats through NumPy's datetime64 printer in a single C loop;
+    DatetimeIndex.strftime goes through Python once per element.
+    Timezone-aware timestamps are formatted in their local time.
+    """
+    index = pd.DatetimeIndex(index)
+    if index.tz is not None:
+        index = index.tz_localize(None)
+    return np.datetime_as_string(index.to_numpy(), unit=unit).astype(object)
+
+
+# Backtest payloads with more series rows than this are streamed
+STREAMING_THRESHOLD = 50_000
+STREAMING_CHUNK_ROWS = 5_000
+BACKTEST_SERIES_KEYS = ("equity_curve", "trades", "monthly_returns", "price_data")
+
+
+def iter_json_chunks(payload: Dict, series_keys, chunk_rows: int = STREAMING_CHUNK_ROWS):
+    """Encode a JSON object piecewise, splitting its long lists into chunks
+
+    The scalar fields go out first, then each list in `series_keys`
+    `chunk_rows` records at a time, so the client starts receiving bytes
+    before the whole payload has been encoded.
+    """
+    head = {key: value for key, value in payload.items() if key not in series_keys}
+    yield orjson.dumps(head)[:-1]
+    for n, key in enumerate(series_keys):
+        rows = payload[key]
+        separator = b"," if head or n else b""
+        yield separator + orjson.dumps(key) + b":["
+        for i in range(0, len(rows), chunk_rows):
+            if i:
+                yield b","
+            yield orjson.dumps(rows[i : i + chunk_rows])[1:-1]
+        yield b"]"
+    yield b"}"
+
+
 class BacktestRequest(BaseModel):
     symbol: str
     strategy: str
@@ -44,9 +339,39 @@ class OptimizationRequest(BaseModel):
     start_date: str
     end_date: str
     initial_capital: float = 10000
-    param_grid: Dict = {}
+    param_grid: Dict[str, List] = {}
     metric: str = "sharpe_ratio"
     max_workers: int = 4
+    timeframe: str = "1d"
+
+
+class EquityPoint(BaseModel):
+    date: str
+    value: float
+    returns: float
+
+
+class Trade(BaseModel):
+    date: str
+    action: str
+    price: float
+    quantity: int
+    value: float
+    pnl: float
+
+
+class MonthlyReturn(BaseModel):
+    month: str
+    return_: float = Field(alias="return")
+
+
+class PriceBar(BaseModel):
+    date: str
+    open: float
+    high: float
+    low: float
+    close: float
+    volume: int
 
 
 class BacktestResult(BaseModel):
@@ -65,10 +390,10 @@ class BacktestResult(BaseModel):
     var_5: float
     cvar_5: float
     total_trades: int
-    equity_curve: List[Dict]
-    trades: List[Dict]
-    monthly_returns: List[Dict]
-    price_data: List[Dict]  # Add price data for charts
+    equity_curve: List[EquityPoint]
+    trades: List[Trade]
+    monthly_returns: List[MonthlyReturn]
+    price_data: List[PriceBar]  # Add price data for charts
 
 
 @app.get("/")
@@ -85,87 +410,30 @@ async def health_check():
     }
 
 
-@app.get("/api/strategies")
-async def get_available_strategies():
-    """Get list of available trading strategies"""
-    return {
+# The catalogue endpoints serve fixed payloads, encoded once at import
+_STRATEGIES_JSON = orjson.dumps(
+    {
         "strategies": [
             {
-                "id": "moving_average_crossover",
-                "name": "Moving Average Crossover",
-                "description": "Buy when fast MA crosses above slow MA, sell when crosses below",
-                "parameters": {
-                    "fast_period": {"type": "int", "default": 10, "min": 5, "max": 50},
-                    "slow_period": {
-                        "type": "int",
-                        "default": 30,
-                        "min": 20,
-                        "max": 200,
-                    },
-                },
-            },
-            {
-                "id": "rsi_mean_reversion",
-                "name": "RSI Mean Reversion",
-                "description": "Buy when RSI < oversold, sell when RSI > overbought",
-                "parameters": {
-                    "period": {"type": "int", "default": 14, "min": 5, "max": 30},
-                    "oversold": {"type": "int", "default": 30, "min": 10, "max": 40},
-                    "overbought": {"type": "int", "default": 70, "min": 60, "max": 90},
-                },
-            },
-            {
-                "id": "bollinger_bands",
-                "name": "Bollinger Band Breakout",
-                "description": "Buy on lower band touch, sell on upper band touch",
-                "parameters": {
-                    "period": {"type": "int", "default": 20, "min": 10, "max": 50},
-                    "std_dev": {
-                        "type": "float",
-                        "default": 2.0,
-                        "min": 1.0,
-                        "max": 3.0,
-                    },
-                },
-            },
-            {
-                "id": "macd_strategy",
-                "name": "MACD Crossover",
-                "description": "Buy when MACD crosses above signal line, sell when crosses below",
-                "parameters": {
-                    "fast_period": {"type": "int", "default": 12, "min": 5, "max": 20},
-                    "slow_period": {"type": "int", "default": 26, "min": 20, "max": 50},
-                    "signal_period": {"type": "int", "default": 9, "min": 5, "max": 15},
-                },
-            },
-            {
-                "id": "volume_momentum",
-                "name": "Volume Momentum",
-                "description": "Volume-confirmed momentum strategy",
-                "parameters": {
-                    "lookback": {"type": "int", "default": 20, "min": 10, "max": 50},
-                    "volume_threshold": {
-                        "type": "float",
-                        "default": 1.5,
-                        "min": 1.0,
-                        "max": 3.0,
-                    },
-                    "momentum_threshold": {
-                        "type": "float",
-                        "default": 0.02,
-                        "min": 0.01,
-                        "max": 0.05,
-                    },
-                },
-            },
+                "id": strategy_id,
+                "name": entry["name"],
+                "description": entry["description"],
+                "parameters": entry["parameters"],
+            }
+            for strategy_id, entry in STRATEGY_REGISTRY.items()
         ]
     }
+)
 
 
-@app.get("/api/symbols")
-async def get_available_symbols():
-    """Get list of available symbols for backtesting"""
-    return {
+@app.get("/api/strategies")
+async def get_available_strategies():
+    """Get list of available trading strategies"""
+    return Response(content=_STRATEGIES_JSON, media_type="application/json")
+
+
+_SYMBOLS_JSON = orjson.dumps(
+    {
         "symbols": [
             {"symbol": "AAPL", "name": "Apple Inc."},
             {"symbol": "MSFT", "name": "Microsoft Corporation"},
@@ -179,12 +447,17 @@ async def get_available_symbols():
             # {"symbol": "ETH-USD", "name": "Ethereum USD"},
         ]
     }
+)
 
 
-@app.get("/api/timeframes")
-async def get_available_timeframes():
-    """Get list of available timeframes for backtesting"""
-    return {
+@app.get("/api/symbols")
+async def get_available_symbols():
+    """Get list of available symbols for backtesting"""
+    return Response(content=_SYMBOLS_JSON, media_type="application/json")
+
+
+_TIMEFRAMES_JSON = orjson.dumps(
+    {
         "timeframes": [
             {
                 "id": "1h",
@@ -223,9 +496,16 @@ async def get_available_timeframes():
             # },
         ]
     }
+)
 
 
-@app.post("/api/backtest", response_model=BacktestResult)
+@app.get("/api/timeframes")
+async def get_available_timeframes():
+    """Get list of available timeframes for backtesting"""
+    return Response(content=_TIMEFRAMES_JSON, media_type="application/json")
+
+
+@app.post("/api/backtest", responses={200: {"model": BacktestResult}})
 async def run_backtest(request: BacktestRequest):
     """Run a backtest for the specified strategy and parameters"""
     try:
@@ -233,272 +513,196 @@ async def run_backtest(request: BacktestRequest):
         if not yf_interval:
             yf_interval = "1H"
 
-        data = None
-        try:
-            ticker = yf.Ticker(request.symbol)
-            data = ticker.history(
-                start=request.start_date,
-                end=request.end_date,
-                interval=yf_interval,
-                auto_adjust=True,
-            )
-            print(data)
-        except Exception as e:
-            raise HTTPException(status_code=400, detail=f"{e}")
-
-        if data.empty:
-            print(f"No data available for symbol {request.symbol}")
-            raise HTTPException(
-                status_code=400, detail=f"No data available for symbol {request.symbol}"
-            )
-
-        # Standardize column names (yfinance sometimes returns different cases)
-        data.columns = [col.lower() for col in data.columns]
-        required_columns = ["open", "high", "low", "close", "volume"]
-
-        for col in required_columns:
-            if col not in data.columns:
-                raise HTTPException(
-                    status_code=400, detail=f"Missing required column: {col}"
-                )
-
-        print(f"Data sample:\n{data.head()}")
+        data = await load_price_data(
+            request.symbol, request.start_date, request.end_date, yf_interval
+        )
 
         # Initialize strategy
-        strategy = None
-        if request.strategy == "moving_average_crossover":
-            strategy = MovingAverageCrossover(
-                fast_period=request.parameters.get("fast_period", 10),
-                slow_period=request.parameters.get("slow_period", 30),
-            )
-        elif request.strategy == "rsi_mean_reversion":
-            strategy = RSIMeanReversion(
-                period=request.parameters.get("period", 14),
-                oversold=request.parameters.get("oversold", 30),
-                overbought=request.parameters.get("overbought", 70),
-            )
-        elif request.strategy == "bollinger_bands":
-            strategy = BollingerBandStrategy(
-                period=request.parameters.get("period", 20),
-                std_dev=request.parameters.get("std_dev", 2.0),
-            )
-        elif request.strategy == "macd_strategy":
-            strategy = MACDStrategy(
-                fast_period=request.parameters.get("fast_period", 12),
-                slow_period=request.parameters.get("slow_period", 26),
-                signal_period=request.parameters.get("signal_period", 9),
-            )
-        elif request.strategy == "volume_momentum":
-            strategy = VolumeMomentumStrategy(
-                lookback=request.parameters.get("lookback", 20),
-                volume_threshold=request.parameters.get("volume_threshold", 1.5),
-                momentum_threshold=request.parameters.get("momentum_threshold", 0.02),
-            )
-        else:
-            raise HTTPException(
-                status_code=400, detail=f"Unknown strategy: {request.strategy}"
-            )
+        strategy = build_strategy(request.strategy, request.parameters)
 
-        # Run backtest
+        # Run backtest on contiguous arrays pulled out of the frame once
         engine = BacktestEngine(initial_capital=request.initial_capital)
-        results = engine.run_backtest(data, strategy)
+        results = engine.run_backtest_arrays(MarketArrays.from_frame(data), strategy)
 
         # Calculate performance metrics
         metrics = PerformanceMetrics(results)
         performance = metrics.calculate_all_metrics()
 
-        # Format results for frontend
-        equity_curve = [
-            {
-                "date": date.strftime("%Y-%m-%d"),
-                "value": float(value),
-                "returns": float(returns),
-            }
-            for date, value, returns in zip(
-                results["equity_curve"].index,
-                results["equity_curve"]["portfolio_value"],
-                results["equity_curve"]["returns"],
-            )
-        ]
+        # Format results for frontend. Bar dates are formatted once and
+        # shared by the price data, equity curve and trades.
+        # The equity curve covers the trailing bars left after the strategy's
+        # warm-up, so rows are mapped to bars by position rather than by
+        # looking dates up in the (possibly non-unique) index.
+        date_labels = format_dates(data.index)
 
-        trades = [
+        equity_df = results["equity_curve"]
+        first_bar = len(data) - len(equity_df)
+        equity_curve = pd.DataFrame(
             {
-                "date": trade["date"].strftime("%Y-%m-%d"),
-                "action": trade["action"],
-                "price": float(trade["price"]),
-                "quantity": int(trade["quantity"]),
-                "value": float(trade["value"]),
-                "pnl": float(trade.get("pnl", 0)),
+                "date": date_labels[first_bar:],
+                "value": equity_df["portfolio_value"].to_numpy(dtype=float),
+                "returns": equity_df["returns"].to_numpy(dtype=float),
             }
-            for trade in results["trades"]
-        ]
+        ).to_dict("records")
+
+        trades_df = pd.DataFrame(
+            results["trades"],
+            columns=["date", "action", "price", "quantity", "value", "pnl"],
+        )
+        trades = trades_df.assign(
+            date=date_labels[first_bar + results["trade_bars"]],
+            price=trades_df["price"].astype(float),
+            quantity=trades_df["quantity"].astype("int64"),
+            value=trades_df["value"].astype(float),
+            pnl=trades_df["pnl"].astype(float).fillna(0.0),
+        ).to_dict("records")
 
         # Calculate monthly returns
         monthly_returns = metrics.calculate_monthly_returns()
-        monthly_returns_formatted = [
-            {"month": month.strftime("%Y-%m"), "return": float(ret)}
-            for month, ret in monthly_returns.items()
-        ]
-
-        # Format price data for charts
-        price_data = [
+        monthly_returns_formatted = pd.DataFrame(
             {
-                "date": date.strftime("%Y-%m-%d"),
-                "open": float(row["open"]),
-                "high": float(row["high"]),
-                "low": float(row["low"]),
-                "close": float(row["close"]),
-                "volume": int(row["volume"]),
+                "month": format_dates(monthly_returns.index.to_timestamp(), unit="M"),
+                "return": monthly_returns.to_numpy(dtype=float),
             }
-            for date, row in data.iterrows()
-        ]
+        ).to_dict("records")
 
-        return BacktestResult(
-            strategy_name=request.strategy,
-            symbol=request.symbol,
-            initial_capital=request.initial_capital,
-            final_capital=float(performance["final_capital"]),
-            total_return=float(performance["total_return"]),
-            total_return_pct=float(performance["total_return_pct"]),
-            sharpe_ratio=float(performance["sharpe_ratio"]),
-            sortino_ratio=float(performance.get("sortino_ratio", 0)),
-            calmar_ratio=float(performance.get("calmar_ratio", 0)),
-            max_drawdown=float(performance["max_drawdown"]),
-            win_rate=float(performance["win_rate"]),
-            profit_factor=float(performance.get("profit_factor", 0)),
-            var_5=float(performance.get("var_5", 0)),
-            cvar_5=float(performance.get("cvar_5", 0)),
-            total_trades=int(performance["total_trades"]),
-            equity_curve=equity_curve,
-            trades=trades,
-            monthly_returns=monthly_returns_formatted,
-            price_data=price_data,
+        # Format price data for charts
+        price_data = (
+            data[["open", "high", "low", "close"]]
+            .astype(float)
+            .assign(volume=data["volume"].astype("int64"))
+            .set_index(pd.Index(date_labels, name="date"))
+            .reset_index()
+            .to_dict("records")
         )
 
+        payload = {
+            "strategy_name": request.strategy,
+            "symbol": request.symbol,
+            "initial_capital": request.initial_capital,
+            "final_capital": float(performance["final_capital"]),
+            "total_return": float(performance["total_return"]),
+            "total_return_pct": float(performance["total_return_pct"]),
+            "sharpe_ratio": float(performance["sharpe_ratio"]),
+            "sortino_ratio": float(performance.get("sortino_ratio", 0)),
+            "calmar_ratio": float(performance.get("calmar_ratio", 0)),
+            "max_drawdown": float(performance["max_drawdown"]),
+            "win_rate": float(performance["win_rate"]),
+            "profit_factor": float(performance.get("profit_factor", 0)),
+            "var_5": float(performance.get("var_5", 0)),
+            "cvar_5": float(performance.get("cvar_5", 0)),
+            "total_trades": int(performance["total_trades"]),
+            "equity_curve": equity_curve,
+            "trades": trades,
+            "monthly_returns": monthly_returns_formatted,
+            "price_data": price_data,
+        }
+
+        # The payload already has the BacktestResult shape, so it is encoded
+        # directly instead of being re-validated by a response_model
+        if len(equity_curve) + len(price_data) > STREAMING_THRESHOLD:
+            return StreamingResponse(
+                iter_json_chunks(payload, BACKTEST_SERIES_KEYS),
+                media_type="application/json",
+            )
+        return ORJSONResponse(content=payload)
+
+    except HTTPException:
+        raise
     except Exception as e:
-        print(f"Error in backtest: {str(e)}")
+        logger.exception("Backtest failed for %s", request.symbol)
         raise HTTPException(status_code=500, detail=f"Backtest failed: {str(e)}")
 
 
-@app.get("/api/fundamentals")
-def get_fundamentals(symbol: str):
+@app.post("/api/optimize")
+async def optimize_strategy(request: OptimizationRequest):
+    """Backtest every combination of a parameter grid and rank them by a metric"""
     try:
-        ticker = yf.Ticker(symbol)
-        info = ticker.info
-        pros = []
-        cons = []
-
-        # Pros
-        if info.get("trailingPE") and info["trailingPE"] < 20:
-            pros.append("Low trailing P/E ratio (potentially undervalued)")
-        if info.get("profitMargins") and info["profitMargins"] > 0.15:
-            pros.append("High profit margins")
-        if info.get("debtToEquity") and info["debtToEquity"] < 1:
-            pros.append("Low debt-to-equity ratio (financially healthy)")
-        if info.get("earningsGrowth") and info["earningsGrowth"] > 0.05:
-            pros.append("Positive earnings growth")
-        if info.get("revenueGrowth") and info["revenueGrowth"] > 0.05:
-            pros.append("Positive revenue growth")
-        if info.get("currentRatio") and info["currentRatio"] > 1.5:
-            pros.append("Strong liquidity (high current ratio)")
-        if info.get("dividendYield") and info["dividendYield"] > 0.02:
-            pros.append("Attractive dividend yield")
-        if info.get("beta") and info["beta"] < 1:
-            pros.append("Low beta (less volatile than market)")
-        # Cons
-        if info.get("trailingPE") and info["trailingPE"] > 40:
-            cons.append("High trailing P/E ratio (may indicate overvaluation)")
-        if info.get("profitMargins") and info["profitMargins"] < 0.05:
-            cons.append("Low profit margins")
-        if info.get("debtToEquity") and info["debtToEquity"] > 2:
-            cons.append("High debt-to-equity ratio (financial risk)")
-        if info.get("earningsGrowth") and info["earningsGrowth"] < 0:
-            cons.append("Negative earnings growth")
-        if info.get("revenueGrowth") and info["revenueGrowth"] < 0:
-            cons.append("Negative revenue growth")
-        if info.get("currentRatio") and info["currentRatio"] < 1:
-            cons.append("Low current ratio (liquidity risk)")
-        if info.get("beta") and info["beta"] > 2:
-            cons.append("High beta (stock is very volatile)")
+        entry = STRATEGY_REGISTRY.get(request.strategy)
+        if entry is None:
+            raise HTTPException(
+                status_code=400, detail=f"Unknown strategy: {request.strategy}"
+            )
+
+        if request.metric not in PerformanceMetrics.RANKING_METRICS:
+            raise HTTPException(
+                status_code=400,
+                detail=f"Cannot rank by metric {request.metric!r}; choose one of "
+                f"{', '.join(PerformanceMetrics.RANKING_METRICS)}",
+            )
+
+        # Sweep the requested values; parameters left out stay at their defaults
+        param_grid = validate_grid(request.strategy, request.param_grid)
+        n_combinations = math.prod(len(values) for values in param_grid.values())
+        if n_combinations > MAX_GRID_COMBINATIONS:
+            raise HTTPException(
+                status_code=400,
+                detail=f"Grid has {n_combinations} combinations "
+                f"(limit {MAX_GRID_COMBINATIONS})",
+            )
+
+        data = await load_price_data(
+            request.symbol, request.start_date, request.end_date, request.timeframe
+        )
+
+        # Combinations run in the shared worker pool; each worker loads the
+        # data once and at most max_workers combinations run at a time
+        engine = BacktestEngine(initial_capital=request.initial_capital)
+        grid_args = (data, entry["class"], param_grid, max(1, request.max_workers))
+        executor = get_grid_executor()
+        try:
+            results = await run_in_threadpool(engine.run_grid, *grid_args, executor)
+        except BrokenProcessPool:
+            logger.warning("Grid worker pool broke; restarting it and retrying")
+            executor = get_grid_executor(broken=executor)
+            results = await run_in_threadpool(engine.run_grid, *grid_args, executor)
+
+        # Best first, in the metric's direction; combinations with an
+        # undefined metric go last
+        sign = 1 if PerformanceMetrics.RANKING_METRICS[request.metric] else -1
+
+        def score(result):
+            value = result["metrics"][request.metric]
+            return sign * value if value == value else float("-inf")
+
+        results.sort(key=score, reverse=True)
+
         return {
-            "symbol": symbol,
-            "longName": info.get("longName"),
-            "sector": info.get("sector"),
-            "industry": info.get("industry"),
-            "marketCap": info.get("marketCap"),
-            "trailingPE": info.get("trailingPE"),
-            "forwardPE": info.get("forwardPE"),
-            "dividendYield": info.get("dividendYield"),
-            "earningsGrowth": info.get("earningsGrowth"),
-            "revenueGrowth": info.get("revenueGrowth"),
-            "profitMargins": info.get("profitMargins"),
-            "returnOnEquity": info.get("returnOnEquity"),
-            "returnOnAssets": info.get("returnOnAssets"),
-            "debtToEquity": info.get("debtToEquity"),
-            "currentRatio": info.get("currentRatio"),
-            "quickRatio": info.get("quickRatio"),
-            "beta": info.get("beta"),
-            "website": info.get("website"),
-            "pros": pros,
-            "cons": cons,
+            "strategy_name": request.strategy,
+            "symbol": request.symbol,
+            "metric": request.metric,
+            "total_combinations": len(results),
+            "best_parameters": results[0]["parameters"] if results else None,
+            "best_metrics": results[0]["metrics"] if results else None,
+            "results": results,
         }
+
+    except HTTPException:
+        raise
+    except Exception as e:
+        logger.exception("Optimization failed for %s", request.symbol)
+        raise HTTPException(status_code=500, detail=f"Optimization failed: {str(e)}")
+
+
+@app.get("/api/fundamentals")
+async def get_fundamentals(symbol: str):
+    try:
+        fundamentals = await run_in_threadpool(summarize_fundamentals, symbol)
+        return ORJSONResponse(
+            content=fundamentals,
+            headers={"Cache-Control": f"public, max-age={FUNDAMENTALS_TTL}"},
+        )
     except Exception as e:
         raise HTTPException(status_code=400, detail=str(e))
 
 
 @app.get("/api/news")
-def get_stock_news(symbol: str):
+async def get_stock_news(symbol: str):
     try:
-        ticker = yf.Ticker(symbol)
-        news = ticker.news if hasattr(ticker, "news") and ticker.news else []
-        # Get top 5 latest news
-        top_news = sorted(
-            news,
-            key=lambda n: (
-                n.get("providerPublishTime", 0) if isinstance(n, dict) and n else 0
-            ),
-            reverse=True,
-        )[:5]
-        flat_news = []
-        for n in top_news:
-            if not isinstance(n, dict):
-                continue
-            content = n.get("content") or {}
-            # Defensive: ensure content is a dict
-            if not isinstance(content, dict):
-                content = {}
-            title = content.get("title") or n.get("title") or "No Title"
-            # Defensive: canonicalUrl/clickThroughUrl may be dict or None
-            canonical_url = content.get("canonicalUrl") or {}
-            click_url = content.get("clickThroughUrl") or {}
-            link = canonical_url.get("url") if isinstance(canonical_url, dict) else None
-            if not link:
-                link = click_url.get("url") if isinstance(click_url, dict) else None
-            if not link:
-                link = n.get("link") or ""
-            provider = content.get("provider") or {}
-            publisher = (
-                provider.get("displayName") if isinstance(provider, dict) else None
-            )
-            if not publisher:
-                publisher = n.get("publisher") or "Unknown"
-            pub_time = content.get("pubDate") or n.get("providerPublishTime") or ""
-            summary = content.get("summary") or n.get("summary") or ""
-            thumbnail = content.get("thumbnail") or {}
-            thumbnail_url = (
-                thumbnail.get("originalUrl") if isinstance(thumbnail, dict) else None
-            )
-            flat_news.append(
-                {
-                    "title": title,
-                    "link": link,
-                    "publisher": publisher,
-                    "providerPublishTime": pub_time,
-                    "summary": summary,
-                    "thumbnail": thumbnail_url,
-                }
-            )
-        return flat_news
+        news = await run_in_threadpool(get_latest_news, symbol)
+        return ORJSONResponse(
+            content=news, headers={"Cache-Control": f"public, max-age={NEWS_TTL}"}
+        )
     except Exception as e:
         raise HTTPException(status_code=400, detail=str(e))
 
@@ -506,4 +710,18 @@ def get_stock_news(symbol: str):
 if __name__ == "__main__":
     import uvicorn
 
-    uvicorn.run(app, host="0.0.0.0", port=8000)
+    logging.basicConfig(level=logging.INFO)
+    # uvloop ("auto" falls back to asyncio where it is unavailable, e.g. on
+    # Windows) and the C HTTP parser; one worker process per core, each
+    # warming up its own Numba kernels at startup. WEB_CONCURRENCY is
+    # exported so the workers can split the cores among their grid pools.
+    web_workers = int(os.environ.get("WEB_CONCURRENCY", os.cpu_count() or 1))
+    os.environ["WEB_CONCURRENCY"] = str(web_workers)
+    uvicorn.run(
+        "main:app",
+        host="0.0.0.0",
+        port=8000,
+        loop="auto",
+        http="httptools",
+        workers=web_workers,
+    )
@@ -0,0 +1,99 @@
+import tempfile
+import time
+import unittest
+from unittest import mock
+
+import pandas as pd
+
+from app import market_data
+
+
+class FakeYahoo:
+    """Daily bars whose prices are adjusted as of the last split, like Yahoo's"""
+
+    def __init__(self):
+        self.split_date = None
+        self.calls = []
+
+    def download(self, symbol, start, end, interval):
+        self.calls.append((pd.Timestamp(start), pd.Timestamp(end)))
+        index = pd.date_range(start, end, freq="D", inclusive="left")
+        split = self.split_date is not None
+        close = 50.0 if split else 100.0
+        return pd.DataFrame(
+            {
+                "Open": close,
+                "High": close,
+                "Low": close,
+                "Close": close,
+                "Adj Close": close,
+                "Volume": 1000,
+                "Dividends": 0.0,
+                "Stock Splits": [
+                    2.0 if split and day == self.split_date else 0.0 for day in index
+                ],
+            },
+            index=index,
+        )
+
+
+class FetchHistoryTest(unittest.TestCase):
+    def setUp(self):
+        self.yahoo = FakeYahoo()
+        patches = [
+            mock.patch.object(market_data, "_download", self.yahoo.download),
+            mock.patch.object(market_data, "CACHE_DIR", tempfile.mkdtemp()),
+        ]
+        for patch in patches:
+            patch.start()
+            self.addCleanup(patch.stop)
+        market_data._history_cache.clear()
+        self.addCleanup(market_data._history_cache.clear)
+
+    def test_serves_covered_range_from_cache(self):
+        market_data.fetch_history("X", "2024-01-01", "2024-03-01", "1d")
+        data = market_data.fetch_history("X", "2024-01-10", "2024-02-01", "1d")
+
+        self.assertEqual(len(self.yahoo.calls), 1)
+        self.assertEqual(data.index[0], pd.Timestamp("2024-01-10"))
+        self.assertEqual(data.index[-1], pd.Timestamp("2024-01-31"))
+
+    def test_downloads_only_missing_bars(self):
+        market_data.fetch_history("X", "2024-02-01", "2024-03-01", "1d")
+        data = market_data.fetch_history("X", "2024-01-01", "2024-04-01", "1d")
+
+        self.assertEqual(self.yahoo.calls[1:], [
+            (pd.Timestamp("2024-01-01"), pd.Timestamp("2024-02-01")),
+            (pd.Timestamp("2024-03-01"), pd.Timestamp("2024-04-01")),
+        ])
+        expected = pd.date_range("2024-01-01", "2024-04-01", freq="D", inclusive="left")
+        self.assertTrue(data.index.equals(expected))
+
+    def test_split_in_new_bars_refreshes_cached_prices(self):
+        market_data.fetch_history("X", "2024-01-01", "2024-02-01", "1d")
+        self.yahoo.split_date = pd.Timestamp("2024-02-15")
+        data = market_data.fetch_history("X", "2024-01-01", "2024-03-01", "1d")
+
+        self.assertEqual(self.yahoo.calls[-1],
+                         (pd.Timestamp("2024-01-01"), pd.Timestamp("2024-03-01")))
+        self.assertEqual(set(data["Close"]), {50.0})
+
+    def test_old_download_is_refreshed_in_full(self):
+        market_data.fetch_history("X", "2024-01-01", "2024-03-01", "1d")
+        with mock.patch.object(market_data.time, "time",
+                               return_value=time.time() + market_data.HISTORY_DISK_TTL):
+            market_data.fetch_history("X", "2024-01-01", "2024-02-01", "1d")
+
+        self.assertEqual(len(self.yahoo.calls), 2)
+
+    def test_coverage_ends_at_download_time(self):
+        before = pd.Timestamp.now()
+        market_data.fetch_history("X", "2024-01-01", "2100-01-01", "1d")
+        history = market_data._history_cache[("X", "1d")]
+
+        self.assertGreaterEqual(history.end, before)
+        self.assertLessEqual(history.end, pd.Timestamp.now())
+
+
+if __name__ == "__main__":
+    unittest.main()